@@ -3,18 +3,28 @@
 from typing import Optional
 
 import django_filters as filters
+from django.core.exceptions import ValidationError
 from django.db.models import Exists, OuterRef
 
 from core.models import Collision, CityDailyWeather, WeatherObservation, WeatherDay, Quadrant; from django.db import models
 
 
+_TRUE = frozenset({"1", "true", "t", "yes", "y"})
+_FALSE = frozenset({"0", "false", "f", "no", "n"})
+_WEATHER_CODE = {
+    "dry": WeatherDay.DRY,
+    "wet": WeatherDay.WET,
+    "snowy": WeatherDay.SNOWY,
+}
+
+
 def _str_to_bool(val: Optional[str]) -> Optional[bool]:
-    if val is None:
+    if val is None or val == "":
         return None
     s = str(val).strip().lower()
-    if s in {"1", "true", "t", "yes", "y"}:
+    if s in _TRUE:
         return True
-    if s in {"0", "false", "f", "no", "n"}:
+    if s in _FALSE:
         return False
     return None
 
@@ -34,6 +44,15 @@ class CollisionFilter(filters.FilterSet):
         model = Collision
         fields = []
 
+    # Form class built once per FilterSet class rather than on every request
+    _form_class = None
+
+    def get_form_class(self):
+        cls = type(self)
+        if cls.__dict__.get("_form_class") is None:
+            cls._form_class = super().get_form_class()
+        return cls._form_class
+
     def filter_from(self, qs, name, value):
         return qs.filter(date__gte=value)
 
@@ -43,37 +62,32 @@ class CollisionFilter(filters.FilterSet):
     def filter_weather_day_city(self, qs, name, value):
         if not value:
             return qs
-        mapping = {
-            "dry": WeatherDay.DRY,
-            "wet": WeatherDay.WET,
-            "snowy": WeatherDay.SNOWY,
-        }
-        code = mapping.get(str(value).strip().lower())
+        code = _WEATHER_CODE.get(str(value).strip().lower())
         if not code:
             return qs
-        dates = CityDailyWeather.objects.filter(weather_day_city=code).values("date")
-        return qs.filter(date__in=dates)
+        exists = CityDailyWeather.objects.filter(date=OuterRef("date"), weather_day_city=code)
+        return qs.filter(Exists(exists))
 
     def filter_freeze_day_city(self, qs, name, value):
         v = _str_to_bool(value)
         if v is None:
             return qs
-        dates = CityDailyWeather.objects.filter(freeze_day_city=v).values("date")
-        return qs.filter(date__in=dates)
+        exists = CityDailyWeather.objects.filter(date=OuterRef("date"), freeze_day_city=v)
+        return qs.filter(Exists(exists))
 
     def filter_heavy_rain(self, qs, name, value):
         v = _str_to_bool(value)
         if v is None:
             return qs
-        dates = CityDailyWeather.objects.filter(precip_any=v).values("date")
-        return qs.filter(date__in=dates)
+        exists = CityDailyWeather.objects.filter(date=OuterRef("date"), precip_any=v)
+        return qs.filter(Exists(exists))
 
     def filter_heavy_snow(self, qs, name, value):
         v = _str_to_bool(value)
         if v is None:
             return qs
-        dates = CityDailyWeather.objects.filter(snow_any=v).values("date")
-        return qs.filter(date__in=dates)
+        exists = CityDailyWeather.objects.filter(date=OuterRef("date"), snow_any=v)
+        return qs.filter(Exists(exists))
 
     def filter_gust_min(self, qs, name, value):
         try:
@@ -99,3 +113,24 @@ class CollisionFilter(filters.FilterSet):
             | models.Q(nearest_station__name__icontains=s)
         )
 
+
+# Read-only FilterSet whose bound filters are shared across requests
+_BINDER = CollisionFilter(queryset=Collision.objects.none())
+
+
+def apply_collision_filters(qs, params):
+    """Apply the CollisionFilter filters named in ``params`` to ``qs``.
+
+    Equivalent to ``CollisionFilter(params, queryset=qs).qs`` but only the
+    filters present are cleaned and applied; invalid values are ignored just
+    as the filter form would drop them.
+    """
+    for name, filter_ in _BINDER.filters.items():
+        if name not in params:
+            continue
+        try:
+            value = filter_.field.clean(params.get(name))
+        except ValidationError:
+            continue
+        qs = filter_.filter(qs, value)
+    return qs
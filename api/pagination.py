@@ -0,0 +1,16 @@
+from rest_framework.pagination import CursorPagination
+
+
+class CollisionCursorPagination(CursorPagination):
+    """Keyset pagination over newest-first collisions; cost is independent of depth."""
+
+    page_size = 50
+    # id breaks ties between incidents reported at the same instant
+    ordering = ("-occurred_at", "-id")
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if ordering[-1].lstrip("-") in ("id", "pk"):
+            return ordering
+        # A requested ?ordering= can tie; id in the same direction keeps pages stable
+        return ordering + ("-id" if ordering[0].startswith("-") else "id",)
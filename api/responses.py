@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+import orjson
+from django.http import HttpResponse
+
+
+class JSONBytesResponse(HttpResponse):
+    """JSON response serialized with orjson, skipping DRF content negotiation.
+
+    For plain-JSON endpoints (stats, near) that have no browsable-API needs.
+    Datetimes render like DRF's encoder: ISO 8601 with ``Z`` for UTC.
+    """
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(content=orjson.dumps(data, option=orjson.OPT_UTC_Z), **kwargs)
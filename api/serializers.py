@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import Optional
 
+from django.db import models
+from django.db.models import OuterRef, QuerySet, Subquery
 from rest_framework import serializers
 
 from core.models import (
@@ -9,9 +11,45 @@ from core.models import (
     WeatherStation,
     WeatherObservation,
     CityDailyWeather,
+    Flag,
 )
 
 
+STATION_WEATHER_FIELDS = (
+    "t_max_c",
+    "t_min_c",
+    "t_mean_c",
+    "total_precip_mm",
+    "total_snow_cm",
+    "gust_kmh",
+)
+
+CITY_WEATHER_FIELDS = (
+    "weather_day_city",
+    "freeze_day_city",
+    "t_max_avg",
+    "t_min_avg",
+    "precip_any",
+    "snow_any",
+    "agreement_ratio",
+)
+
+
+def annotate_weather(qs: QuerySet) -> QuerySet:
+    """Attach station/city weather columns so detail rendering needs no extra queries."""
+    station_obs = WeatherObservation.objects.filter(
+        station_id=OuterRef("nearest_station_id"), date=OuterRef("date")
+    )
+    city = CityDailyWeather.objects.filter(date=OuterRef("date"))
+    annotations = {"station_obs_id": Subquery(station_obs.values("id")[:1])}
+    for f in STATION_WEATHER_FIELDS:
+        annotations[f"station_obs_{f}"] = Subquery(station_obs.values(f)[:1])
+    annotations["city_weather_id"] = Subquery(city.values("id")[:1])
+    for f in CITY_WEATHER_FIELDS:
+        annotations[f"city_weather_{f}"] = Subquery(city.values(f)[:1])
+    return qs.annotate(**annotations)
+
+
 class WeatherStationSerializer(serializers.ModelSerializer):
     class Meta:
         model = WeatherStation
@@ -58,11 +96,32 @@ class CityWeatherSerializer(serializers.Serializer):
     agreement_ratio = serializers.FloatField(allow_null=True)
 
 
+class CollisionDetailListSerializer(serializers.ListSerializer):
+    """Fetches weather for a whole page in two queries, keyed for the child."""
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        station_ids = {c.nearest_station_id for c in items if c.nearest_station_id}
+        dates = {c.date for c in items}
+        obs = WeatherObservation.objects.filter(
+            station_id__in=station_ids, date__in=dates
+        ).values("station_id", "date", *STATION_WEATHER_FIELDS)
+        self.context["station_weather"] = {
+            (o.pop("station_id"), o.pop("date")): o for o in obs
+        }
+        city = CityDailyWeather.objects.filter(date__in=dates).values(
+            "date", *CITY_WEATHER_FIELDS
+        )
+        self.context["city_weather"] = {c.pop("date"): c for c in city}
+        return super().to_representation(items)
+
+
 class CollisionDetailSerializer(CollisionListSerializer):
     station_weather = serializers.SerializerMethodField()
     city_weather = serializers.SerializerMethodField()
 
     class Meta(CollisionListSerializer.Meta):
+        list_serializer_class = CollisionDetailListSerializer
         fields = CollisionListSerializer.Meta.fields + [
             "description",
             "intersection_key",
@@ -71,36 +130,35 @@ class CollisionDetailSerializer(CollisionListSerializer):
         ]
 
     def get_station_weather(self, obj: Collision) -> Optional[dict]:
-        if not obj.nearest_station:
+        if not obj.nearest_station_id:
             return None
+        batch = self.context.get("station_weather")
+        if batch is not None:
+            return batch.get((obj.nearest_station_id, obj.date))
+        if hasattr(obj, "station_obs_id"):
+            if obj.station_obs_id is None:
+                return None
+            return {f: getattr(obj, f"station_obs_{f}") for f in STATION_WEATHER_FIELDS}
         obs = (
             WeatherObservation.objects.filter(
-                station=obj.nearest_station, date=obj.date
-            )
-            .values(
-                "t_max_c",
-                "t_min_c",
-                "t_mean_c",
-                "total_precip_mm",
-                "total_snow_cm",
-                "gust_kmh",
+                station_id=obj.nearest_station_id, date=obj.date
             )
+            .values(*STATION_WEATHER_FIELDS)
             .first()
         )
         return obs or None
 
     def get_city_weather(self, obj: Collision) -> Optional[dict]:
+        batch = self.context.get("city_weather")
+        if batch is not None:
+            return batch.get(obj.date)
+        if hasattr(obj, "city_weather_id"):
+            if obj.city_weather_id is None:
+                return None
+            return {f: getattr(obj, f"city_weather_{f}") for f in CITY_WEATHER_FIELDS}
         cw = (
             CityDailyWeather.objects.filter(date=obj.date)
-            .values(
-                "weather_day_city",
-                "freeze_day_city",
-                "t_max_avg",
-                "t_min_avg",
-                "precip_any",
-                "snow_any",
-                "agreement_ratio",
-            )
+            .values(*CITY_WEATHER_FIELDS)
             .first()
         )
         return cw or None
@@ -115,8 +173,6 @@ class FlagSerializer(serializers.Serializer):
     created_at = serializers.DateTimeField(read_only=True)
 
     def create(self, validated_data):
-        from core.models import Flag
-
         return Flag.objects.create(**validated_data)
 
     def validate_note(self, value: str) -> str:
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.generation import bump_stats_version
+from core.models import CityDailyWeather, Collision, WeatherObservation, WeatherStation
+
+
+@receiver(post_save, sender=Collision)
+@receiver(post_delete, sender=Collision)
+@receiver(post_save, sender=CityDailyWeather)
+@receiver(post_delete, sender=CityDailyWeather)
+@receiver(post_save, sender=WeatherObservation)
+@receiver(post_delete, sender=WeatherObservation)
+@receiver(post_save, sender=WeatherStation)
+@receiver(post_delete, sender=WeatherStation)
+def invalidate_stats_cache(sender, **kwargs):
+    # Stats and near results depend on collisions and the weather they are filtered by;
+    # any change makes cached payloads and issued ETags stale
+    bump_stats_version()
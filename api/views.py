@@ -1,16 +1,27 @@
+import hashlib
+from typing import Optional
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
 from django.shortcuts import render
+from django.utils.cache import get_conditional_response
 from django.http import HttpRequest, HttpResponse, QueryDict
-from django.db.models import Sum, Count
-from django.db.models.functions import ExtractMonth
+from django.db.models import BigIntegerField, Count, Min, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import viewsets, mixins, status
 from rest_framework.permissions import AllowAny
 from django.urls import reverse
 
+from core.generation import stats_version
 from core.models import (
     Collision,
+    CollisionDailyRollup,
     CityDailyWeather,
+    Flag,
     Quadrant,
     WeatherDay,
     WeatherStation,
@@ -22,35 +33,54 @@ from .serializers import (
     CollisionListSerializer,
     CollisionDetailSerializer,
     FlagSerializer,
+    WeatherStationSerializer,
+    annotate_weather,
 )
-from .filters import CollisionFilter
+from .filters import CollisionFilter, apply_collision_filters
+from .pagination import CollisionCursorPagination
+from .responses import JSONBytesResponse
 
-def index(request: HttpRequest) -> HttpResponse:
-    # Basic counts to signal DB seeding status
-    collisions_count = Collision.objects.count()
-    stations_count = WeatherStation.objects.count()
-    observations_count = WeatherObservation.objects.count()
-    city_days_count = CityDailyWeather.objects.count()
-
-    # Provide a sample collision_id for a quick detail link
-    sample_collision_id = (
-        Collision.objects.order_by('-occurred_at')
-        .values_list('collision_id', flat=True)
-        .first()
-    )
+INDEX_CACHE_TIMEOUT = 60
 
-    ctx = {
+
+def _index_context() -> dict:
+    """Seeding-status counts and a sample collision id in one round-trip."""
+    qn = connection.ops.quote_name
+    counts = ", ".join(
+        f"(SELECT COUNT(*) FROM {qn(model._meta.db_table)})"
+        for model in (Collision, WeatherStation, WeatherObservation, CityDailyWeather)
+    )
+    sample = (
+        f"(SELECT {qn('collision_id')} FROM {qn(Collision._meta.db_table)}"
+        f" ORDER BY {qn('occurred_at')} DESC LIMIT 1)"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT {counts}, {sample}")
+        collisions, stations, observations, city_days, sample_id = cursor.fetchone()
+    return {
         'counts': {
-            'collisions': collisions_count,
-            'stations': stations_count,
-            'observations': observations_count,
-            'city_days': city_days_count,
+            'collisions': collisions,
+            'stations': stations,
+            'observations': observations,
+            'city_days': city_days,
         },
-        'sample_collision_id': sample_collision_id,
+        # Provide a sample collision_id for a quick detail link
+        'sample_collision_id': sample_id,
     }
+
+
+def index(request: HttpRequest) -> HttpResponse:
+    # Basic counts to signal DB seeding status; they change only on ingest
+    ctx = cache.get_or_set(f"index:{stats_version()}", _index_context, INDEX_CACHE_TIMEOUT)
     return render(request, 'index.html', ctx)
 
 
+# Columns the list serializer reads, including the nested station's
+_LIST_COLUMNS = tuple(
+    f for f in CollisionListSerializer.Meta.fields if f != "nearest_station"
+) + tuple(f"nearest_station__{f}" for f in WeatherStationSerializer.Meta.fields)
+
+
 class CollisionViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = (
         Collision.objects.select_related("nearest_station").order_by("-occurred_at")
@@ -59,8 +89,21 @@ class CollisionViewSet(viewsets.ReadOnlyModelViewSet):
     lookup_field = "collision_id"
     lookup_value_regex = r"[^/]+"
     filterset_class = CollisionFilter
+    pagination_class = CollisionCursorPagination
     search_fields = ["description", "location_text"]
-    ordering_fields = ["occurred_at", "date", "quadrant", "count"]
+    # Only occurred_at: the cursor keys on the first ordering column, and low-cardinality
+    # columns (quadrant, count) would page by an ever-growing OFFSET through their ties
+    ordering_fields = ["occurred_at"]
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.action == "list":
+            # List rows skip the wide text columns only the detail view shows
+            qs = qs.only(*_LIST_COLUMNS)
+        if self.action == "retrieve":
+            # Weather is read from annotations instead of per-object lookups
+            qs = annotate_weather(qs)
+        return qs
 
     def get_serializer_class(self):
         if self.action == "retrieve":
@@ -80,8 +123,6 @@ class FlagViewSet(
     permission_classes = [AllowAny]
 
     def get_queryset(self):
-        from core.models import Flag
-
         return Flag.objects.select_related("collision").order_by("-created_at")
 
     def create(self, request, *args, **kwargs):
@@ -98,24 +139,135 @@ class FlagViewSet(
         return response
 
 
+# Filter params (plus from/to aliases); requests without any skip the FilterSet
+_FILTER_KEYS = frozenset(CollisionFilter.base_filters) | {"from", "to"}
+
+
 def _normalized_params(request: HttpRequest) -> QueryDict:
-    """Map common alias params (e.g., from/to) to filter params."""
-    q = request.GET.copy()
-    if "from" in q and "from_date" not in q:
-        q["from_date"] = q.get("from")
-    if "to" in q and "to_date" not in q:
-        q["to_date"] = q.get("to")
+    """Map common alias params (e.g., from/to) to filter params.
+
+    The request's own QueryDict is returned as-is unless an alias needs
+    resolving; the form ignores keys it has no filter for.
+    """
+    g = request.GET
+    needs_from = "from" in g and "from_date" not in g
+    needs_to = "to" in g and "to_date" not in g
+    if not (needs_from or needs_to):
+        return g
+    q = QueryDict(mutable=True)
+    for key in _FILTER_KEYS.intersection(g.keys()):
+        q.setlist(key, g.getlist(key))
+    if needs_from:
+        q["from_date"] = g.get("from")
+    if needs_to:
+        q["to_date"] = g.get("to")
     return q
 
 
 def _filtered_collisions(request: HttpRequest):
     qs = Collision.objects.all()
-    f = CollisionFilter(_normalized_params(request), queryset=qs)
-    return f.qs
+    if _FILTER_KEYS.isdisjoint(request.GET.keys()):
+        return qs
+    return apply_collision_filters(qs, _normalized_params(request))
+
+
+# Filters that need per-collision columns the rollup does not keep
+_ROLLUP_UNSUPPORTED = ("gust_min", "station")
+
+
+def _stats_collisions(request: HttpRequest):
+    """Filtered rows to aggregate for Stats: the rollup table when it can answer."""
+    if any(request.GET.get(k) for k in _ROLLUP_UNSUPPORTED):
+        return _filtered_collisions(request)
+    if not CollisionDailyRollup.objects.exists():
+        return _filtered_collisions(request)
+    qs = CollisionDailyRollup.objects.all()
+    if _FILTER_KEYS.isdisjoint(request.GET.keys()):
+        return qs
+    return apply_collision_filters(qs, _normalized_params(request))
+
+
+def _int_param(raw: Optional[str], default: int) -> int:
+    """Parse an optional integer query param without exception handling."""
+    if not raw:
+        return default
+    s = raw.strip()
+    digits = s[1:] if s[:1] in ("-", "+") else s
+    if digits.isascii() and digits.isdigit():
+        return int(s)
+    return default
+
 
+def _sum_count():
+    # Collision.count can exceed 1, so this stays a SUM; typed and non-null for every backend
+    return Coalesce(Sum("count", output_field=BigIntegerField()), 0)
+
+
+def _dense_totals(pairs, keys) -> dict:
+    """Fill (bucket, total) pairs onto a pre-zeroed axis, keeping axis order."""
+    totals = dict.fromkeys(keys, 0)
+    for key, total in pairs:
+        if key in totals:
+            totals[key] = total
+    return totals
+
+
+STATS_CACHE_TIMEOUT = getattr(settings, "STATS_CACHE_TIMEOUT", 60 * 60)
+
+
+def _params_digest(request: HttpRequest) -> str:
+    params = urlencode(sorted(request.GET.lists()), doseq=True)
+    return hashlib.blake2b(params.encode(), digest_size=16).hexdigest()
+
+
+def _stats_cache_key(prefix: str, request: HttpRequest, version: Optional[int] = None) -> str:
+    if version is None:
+        version = stats_version()
+    return f"stats:{version}:{prefix}:{_params_digest(request)}"
+
+
+def _conditional_response(request: HttpRequest, prefix: str, build) -> HttpResponse:
+    """Answer If-None-Match from the stats generation, else build().
+
+    The generation changes whenever the underlying data does, so it seeds the
+    ETag. No Last-Modified is sent: it has one-second resolution and the
+    generation can move twice within a second.
+    """
+    version = stats_version()
+    etag = f'W/"{version:x}-{prefix}-{_params_digest(request)}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = build()
+    if response.status_code in (200, 304):
+        response.headers["ETag"] = etag
+    return response
+
+
+# Stats view whose payload is cached per normalized query string and data
+# generation; subclasses set cache_prefix and define payload(request) -> dict.
+# Kept as a comment: drf-spectacular would otherwise publish a base class
+# docstring as every subclass's operation description.
+class _CachedStatsView(APIView):
 
-class StatsMonthlyTrend(APIView):
     permission_classes = [AllowAny]
+    cache_prefix = ""
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Fail when the view is defined rather than on its first request
+        if not cls.cache_prefix or not callable(getattr(cls, "payload", None)):
+            raise TypeError(f"{cls.__name__} must set cache_prefix and define payload()")
+
+    def cached_response(self, request: HttpRequest) -> HttpResponse:
+        def build():
+            key = _stats_cache_key(self.cache_prefix, request)
+            return JSONBytesResponse(cache.get_or_set(key, lambda: self.payload(request), STATS_CACHE_TIMEOUT))
+
+        return _conditional_response(request, self.cache_prefix, build)
+
+
+class StatsMonthlyTrend(_CachedStatsView):
+    cache_prefix = "monthly-trend"
 
     @extend_schema(
         responses=OpenApiTypes.OBJECT,
@@ -135,17 +287,20 @@ class StatsMonthlyTrend(APIView):
         ],
     )
     def get(self, request: HttpRequest):
-        qs = _filtered_collisions(request)
+        return self.cached_response(request)
+
+    def payload(self, request: HttpRequest) -> dict:
+        qs = _stats_collisions(request)
         # Sum counts by existing month field
-        data = qs.values("month").annotate(total=Sum("count")).order_by("month")
+        data = qs.values_list("month").annotate(total=_sum_count()).order_by()
         # Ensure months 1..12 present
-        by_month = {row["month"]: row["total"] for row in data}
-        out = [{"month": m, "total": int(by_month.get(m, 0) or 0)} for m in range(1, 13)]
-        return Response({"results": out})
+        by_month = _dense_totals(data, range(1, 13))
+        out = [{"month": m, "total": t} for m, t in by_month.items()]
+        return {"results": out}
 
 
-class StatsByHour(APIView):
-    permission_classes = [AllowAny]
+class StatsByHour(_CachedStatsView):
+    cache_prefix = "by-hour"
 
     @extend_schema(
         responses=OpenApiTypes.OBJECT,
@@ -164,24 +319,23 @@ class StatsByHour(APIView):
         ],
     )
     def get(self, request: HttpRequest):
+        return self.cached_response(request)
+
+    def payload(self, request: HttpRequest) -> dict:
         commute = (request.GET.get("commute") or "").lower().strip()
-        qs = _filtered_collisions(request)
+        qs = _stats_collisions(request)
         if commute == "am":
             qs = qs.filter(hour__in=[7, 8, 9])
         elif commute == "pm":
             qs = qs.filter(hour__in=[16, 17, 18])
-        data = (
-            qs.values("hour")
-            .annotate(total=Sum("count"))
-            .order_by("hour")
-        )
-        by_hour = {row["hour"]: row["total"] for row in data}
-        out = [{"hour": h, "total": int(by_hour.get(h, 0) or 0)} for h in range(0, 24)]
-        return Response({"results": out, "commute": commute or None})
+        data = qs.values_list("hour").annotate(total=_sum_count()).order_by()
+        by_hour = _dense_totals(data, range(0, 24))
+        out = [{"hour": h, "total": t} for h, t in by_hour.items()]
+        return {"results": out, "commute": commute or None}
 
 
-class StatsWeekday(APIView):
-    permission_classes = [AllowAny]
+class StatsWeekday(_CachedStatsView):
+    cache_prefix = "weekday"
 
     @extend_schema(
         responses=OpenApiTypes.OBJECT,
@@ -199,15 +353,18 @@ class StatsWeekday(APIView):
         ],
     )
     def get(self, request: HttpRequest):
-        qs = _filtered_collisions(request)
-        data = qs.values("weekday").annotate(total=Sum("count")).order_by("weekday")
-        by_weekday = {row["weekday"]: row["total"] for row in data}
-        out = [{"weekday": d, "total": int(by_weekday.get(d, 0) or 0)} for d in range(0, 7)]
-        return Response({"results": out})
+        return self.cached_response(request)
 
+    def payload(self, request: HttpRequest) -> dict:
+        qs = _stats_collisions(request)
+        data = qs.values_list("weekday").annotate(total=_sum_count()).order_by()
+        by_weekday = _dense_totals(data, range(0, 7))
+        out = [{"weekday": d, "total": t} for d, t in by_weekday.items()]
+        return {"results": out}
 
-class StatsQuadrantShare(APIView):
-    permission_classes = [AllowAny]
+
+class StatsQuadrantShare(_CachedStatsView):
+    cache_prefix = "quadrant-share"
 
     @extend_schema(
         responses=OpenApiTypes.OBJECT,
@@ -225,17 +382,20 @@ class StatsQuadrantShare(APIView):
         ],
     )
     def get(self, request: HttpRequest):
-        qs = _filtered_collisions(request)
-        data = qs.values("quadrant").annotate(total=Sum("count")).order_by("quadrant")
+        return self.cached_response(request)
+
+    def payload(self, request: HttpRequest) -> dict:
+        qs = _stats_collisions(request)
+        data = qs.values_list("quadrant").annotate(total=_sum_count()).order_by()
         # Ensure all quadrants present
         keys = [Quadrant.NE, Quadrant.NW, Quadrant.SE, Quadrant.SW, Quadrant.UNKNOWN]
-        by_q = {row["quadrant"]: row["total"] for row in data}
-        out = [{"quadrant": q, "total": int(by_q.get(q, 0) or 0)} for q in keys]
-        return Response({"results": out})
+        by_q = _dense_totals(data, keys)
+        out = [{"quadrant": q, "total": t} for q, t in by_q.items()]
+        return {"results": out}
 
 
-class StatsTopIntersections(APIView):
-    permission_classes = [AllowAny]
+class StatsTopIntersections(_CachedStatsView):
+    cache_prefix = "top-intersections"
 
     @extend_schema(
         responses=OpenApiTypes.OBJECT,
@@ -254,32 +414,34 @@ class StatsTopIntersections(APIView):
         ],
     )
     def get(self, request: HttpRequest):
-        try:
-            limit = int(request.GET.get("limit", 10))
-        except Exception:
-            limit = 10
+        return self.cached_response(request)
+
+    def payload(self, request: HttpRequest) -> dict:
+        limit = _int_param(request.GET.get("limit"), 10)
         limit = max(1, min(limit, 100))
 
         qs = _filtered_collisions(request).exclude(intersection_key="")
+        # One group per intersection; MIN picks a canonical label for its location text
         data = (
-            qs.values("intersection_key", "location_text")
-            .annotate(total=Sum("count"), n=Count("collision_id"))
-            .order_by("-total", "location_text")[:limit]
+            qs.values_list("intersection_key")
+            .annotate(label=Min("location_text"), total=_sum_count(), n=Count("*"))
+            # Tie-break on the indexed key rather than sorting on free text
+            .order_by("-total", "intersection_key")[:limit]
         )
         out = [
             {
-                "intersection_key": row["intersection_key"],
-                "location_text": row["location_text"],
-                "total": int(row["total"] or 0),
-                "collisions": int(row["n"] or 0),
+                "intersection_key": key,
+                "location_text": location_text,
+                "total": total,
+                "collisions": n,
             }
-            for row in data
+            for key, location_text, total, n in data.iterator(chunk_size=limit)
         ]
-        return Response({"results": out, "limit": limit})
+        return {"results": out, "limit": limit}
 
 
-class StatsByWeather(APIView):
-    permission_classes = [AllowAny]
+class StatsByWeather(_CachedStatsView):
+    cache_prefix = "by-weather"
 
     @extend_schema(
         responses=OpenApiTypes.OBJECT,
@@ -297,43 +459,89 @@ class StatsByWeather(APIView):
         ],
     )
     def get(self, request: HttpRequest):
-        qs = _filtered_collisions(request)
-        # Join via date to CityDailyWeather for city-level weather day
-        dates = list(qs.values_list("date", flat=True).distinct())
-        weather = (
-            CityDailyWeather.objects.filter(date__in=dates)
-            .values("weather_day_city")
-            .annotate(days=Count("date"))
+        return self.cached_response(request)
+
+    def payload(self, request: HttpRequest) -> dict:
+        qs = _stats_collisions(request)
+        # Join via date to CityDailyWeather for city-level weather day, grouped in SQL
+        city_day = CityDailyWeather.objects.filter(date=OuterRef("date")).values("weather_day_city")[:1]
+        data = (
+            qs.annotate(wd=Subquery(city_day))
+            .values_list("wd")
+            .annotate(total=_sum_count())
+            .order_by()
         )
-        # Totals for collisions per weather day
-        mapping = {WeatherDay.DRY: 0, WeatherDay.WET: 0, WeatherDay.SNOWY: 0}
-        # count collisions grouped by date, then map to weather_day_city
-        per_date = qs.values("date").annotate(total=Sum("count"))
-        weather_by_date = {
-            d2["date"]: d2["weather_day_city"]
-            for d2 in CityDailyWeather.objects.filter(
-                date__in=[p["date"] for p in per_date]
-            ).values("date", "weather_day_city")
-        }
-        for row in per_date:
-            day = weather_by_date.get(row["date"]) or None
-            if day in mapping:
-                mapping[day] += int(row["total"] or 0)
-        out = [
-            {"weather_day": k, "total": v}
-            for k, v in (
-                (WeatherDay.DRY, mapping[WeatherDay.DRY]),
-                (WeatherDay.WET, mapping[WeatherDay.WET]),
-                (WeatherDay.SNOWY, mapping[WeatherDay.SNOWY]),
-            )
-        ]
-        return Response({"results": out})
+        mapping = _dense_totals(data, (WeatherDay.DRY, WeatherDay.WET, WeatherDay.SNOWY))
+        out = [{"weather_day": k, "total": v} for k, v in mapping.items()]
+        return {"results": out}
+
+
+_BUNDLE_PARTS = (
+    ("monthly_trend", StatsMonthlyTrend),
+    ("by_hour", StatsByHour),
+    ("weekday", StatsWeekday),
+    ("quadrant_share", StatsQuadrantShare),
+    ("top_intersections", StatsTopIntersections),
+    ("by_weather", StatsByWeather),
+)
+
+
+class StatsBundle(APIView):
+    """All stats payloads for one filter set in a single response.
+
+    Shares cache entries with the individual endpoints, fetched in one
+    get_many (a single MGET on Redis); only missing payloads are computed.
+    """
+
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        responses=OpenApiTypes.OBJECT,
+        parameters=[
+            OpenApiParameter(name='commute', type=OpenApiTypes.STR, required=False, description='am|pm'),
+            OpenApiParameter(name='limit', type=OpenApiTypes.INT, required=False),
+            OpenApiParameter(name='from', type=OpenApiTypes.DATE, required=False),
+            OpenApiParameter(name='to', type=OpenApiTypes.DATE, required=False),
+            OpenApiParameter(name='quadrant', type=OpenApiTypes.STR, required=False),
+            OpenApiParameter(name='weather_day_city', type=OpenApiTypes.STR, required=False),
+            OpenApiParameter(name='freeze_day_city', type=OpenApiTypes.BOOL, required=False),
+            OpenApiParameter(name='heavy_rain', type=OpenApiTypes.BOOL, required=False),
+            OpenApiParameter(name='heavy_snow', type=OpenApiTypes.BOOL, required=False),
+            OpenApiParameter(name='gust_min', type=OpenApiTypes.NUMBER, required=False),
+            OpenApiParameter(name='station', type=OpenApiTypes.STR, required=False),
+            OpenApiParameter(name='search', type=OpenApiTypes.STR, required=False),
+        ],
+    )
+    def get(self, request: HttpRequest):
+        return _conditional_response(request, "bundle", lambda: JSONBytesResponse(self.payload(request)))
+
+    def payload(self, request: HttpRequest) -> dict:
+        version = stats_version()
+        views = {name: view_class() for name, view_class in _BUNDLE_PARTS}
+        keys = {name: _stats_cache_key(view.cache_prefix, request, version) for name, view in views.items()}
+        found = cache.get_many(keys.values())
+        out = {}
+        missing = {}
+        for name, view in views.items():
+            key = keys[name]
+            if key in found:
+                out[name] = found[key]
+            else:
+                out[name] = missing[key] = view.payload(request)
+        if missing:
+            cache.set_many(missing, STATS_CACHE_TIMEOUT)
+        return out
 
 
 # --- Stage 6: Near endpoint ---
-from math import radians, sin, cos, asin, sqrt
+from functools import lru_cache
+from math import radians, cos
+
+from django.db.models import ExpressionWrapper, F, FloatField, Value
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
 
 
+@lru_cache(maxsize=4096)
 def _bbox(lat: float, lon: float, radius_km: float):
     # Approximate degree deltas
     lat_delta = radius_km / 111.32
@@ -342,13 +550,13 @@ def _bbox(lat: float, lon: float, radius_km: float):
     return (lat - lat_delta, lat + lat_delta, lon - lon_delta, lon + lon_delta)
 
 
-def _haversine_km(lon1: float, lat1: float, lon2: float, lat2: float) -> float:
-    lon1, lat1, lon2, lat2 = map(radians, [lon1, lat1, lon2, lat2])
-    dlon = lon2 - lon1
-    dlat = lat2 - lat1
-    a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
-    c = 2 * asin(sqrt(a))
-    return 6371 * c
+def _haversine_km_expr(lat: float, lon: float):
+    """Great-circle distance (km) from (lat, lon) to each row, computed in SQL."""
+    lat_r = Radians(F("latitude"))
+    dlat = lat_r - Value(radians(lat))
+    dlon = Radians(F("longitude")) - Value(radians(lon))
+    a = Power(Sin(dlat / 2), 2) + Value(cos(radians(lat))) * Cos(lat_r) * Power(Sin(dlon / 2), 2)
+    return ExpressionWrapper(2 * 6371 * ASin(Sqrt(a)), output_field=FloatField())
 
 
 class CollisionsNear(APIView):
@@ -389,21 +597,26 @@ class CollisionsNear(APIView):
             radius = 1.0
         radius = min(radius, 10.0)
 
-        try:
-            limit = int(request.GET.get("limit", 100))
-        except ValueError:
-            limit = 100
+        limit = _int_param(request.GET.get("limit"), 100)
         limit = max(1, min(limit, 500))
 
+        return _conditional_response(
+            request, "near", lambda: self._near_response(request, lat, lon, radius, limit)
+        )
+
+    def _near_response(self, request: HttpRequest, lat: float, lon: float, radius: float, limit: int) -> HttpResponse:
         lat_min, lat_max, lon_min, lon_max = _bbox(lat, lon, radius)
 
         base = _filtered_collisions(request)
         # Apply coarse bounding box first
         qs = base.filter(latitude__gte=lat_min, latitude__lte=lat_max, longitude__gte=lon_min, longitude__lte=lon_max)
 
-        # Select only needed fields for distance computation
-        rows = list(
-            qs.values(
+        # Distance filter, ordering and limit run in the database
+        rows = (
+            qs.annotate(distance_km=_haversine_km_expr(lat, lon))
+            .filter(distance_km__lte=radius)
+            .order_by("distance_km")
+            .values_list(
                 "collision_id",
                 "occurred_at",
                 "quadrant",
@@ -411,31 +624,25 @@ class CollisionsNear(APIView):
                 "latitude",
                 "count",
                 "location_text",
-            )
+                "distance_km",
+            )[:limit]
         )
+        # Tuple rows: one dict per returned collision, none per fetched row
+        out = [
+            {
+                "collision_id": cid,
+                "occurred_at": occurred_at,
+                "quadrant": quadrant,
+                "longitude": rlon,
+                "latitude": rlat,
+                "count": int(count or 1),
+                "location_text": location_text,
+                "distance_km": round(d, 3),
+            }
+            for cid, occurred_at, quadrant, rlon, rlat, count, location_text, d in rows.iterator(chunk_size=limit)
+        ]
 
-        # Compute precise distance and filter to radius
-        out = []
-        for r in rows:
-            rlon = float(r["longitude"])
-            rlat = float(r["latitude"])
-            d = _haversine_km(lon, lat, rlon, rlat)
-            if d <= radius:
-                out.append({
-                    "collision_id": r["collision_id"],
-                    "occurred_at": r["occurred_at"],
-                    "quadrant": r["quadrant"],
-                    "longitude": rlon,
-                    "latitude": rlat,
-                    "count": int(r["count"] or 1),
-                    "location_text": r["location_text"],
-                    "distance_km": round(d, 3),
-                })
-
-        out.sort(key=lambda x: x["distance_km"])  # nearest first
-        out = out[:limit]
-
-        return Response({
+        return JSONBytesResponse({
             "params": {"lat": lat, "lon": lon, "radius_km": radius, "limit": limit},
             "results": out,
             "count": len(out),
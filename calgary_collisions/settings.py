@@ -154,3 +154,20 @@ SPECTACULAR_SETTINGS = {
     'DESCRIPTION': 'Django + DRF API with weather integration and OpenAPI docs.',
     'VERSION': '0.1.0',
 }
+
+# Cache: Redis when REDIS_URL is set (requires the `redis` package), else local memory
+REDIS_URL = os.environ.get('REDIS_URL', '').strip()
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+
+# Stats endpoint response cache (seconds); the 2024 dataset is a static snapshot
+STATS_CACHE_TIMEOUT = int(os.environ.get('STATS_CACHE_TIMEOUT', 60 * 60))
+
+# How long each process trusts its cached copy of the data generation (seconds);
+# the generation itself lives in the database so loader runs reach every worker
+STATS_VERSION_TTL = int(os.environ.get('STATS_VERSION_TTL', 5))
@@ -0,0 +1,41 @@
+"""Data generation shared by every process through the database.
+
+Stats payloads, their ETags and the index page are keyed by this value, so
+moving it forward invalidates them in web workers and loader processes alike.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import DataGeneration
+
+GENERATION_PK = 1
+STATS_VERSION_KEY = "stats:version"
+# How long a process trusts its cached copy before re-reading the database (seconds)
+STATS_VERSION_TTL = getattr(settings, "STATS_VERSION_TTL", 5)
+
+
+def stats_version() -> int:
+    """Current data generation, cached briefly to spare a query per request."""
+    version = cache.get(STATS_VERSION_KEY)
+    if version is None:
+        version = DataGeneration.objects.filter(pk=GENERATION_PK).values_list("version", flat=True).first()
+        if version is None:
+            version = bump_stats_version()
+        cache.set(STATS_VERSION_KEY, version, STATS_VERSION_TTL)
+    return version
+
+
+def bump_stats_version() -> int:
+    """Move to a new generation, invalidating every cached stats payload and ETag."""
+    version = time.time_ns()
+    DataGeneration.objects.bulk_create(
+        [DataGeneration(pk=GENERATION_PK, version=version)],
+        update_conflicts=True,
+        unique_fields=["id"],
+        update_fields=["version"],
+    )
+    cache.delete(STATS_VERSION_KEY)
+    return version
@@ -1,76 +1,100 @@
 from __future__ import annotations
 
-from collections import Counter
-from statistics import mean
 from typing import Optional
 
 from django.core.management.base import BaseCommand
 from django.db import transaction
+from django.db.models import Avg, Count, Q
 
+from core.generation import bump_stats_version
 from core.models import WeatherObservation, CityDailyWeather, WeatherDay
 
 
+UPDATE_FIELDS = [
+    "weather_day_city",
+    "freeze_day_city",
+    "t_max_avg",
+    "t_min_avg",
+    "precip_any",
+    "snow_any",
+    "agreement_ratio",
+]
+
+
 class Command(BaseCommand):
     help = "Build city-level daily weather aggregates from station observations."
 
     def handle(self, *args, **options):
-        dates = (
-            WeatherObservation.objects.order_by().values_list("date", flat=True).distinct()
+        # One grouped scan over observations; Avg/Count ignore nulls like the
+        # per-station value lists did
+        per_date = (
+            WeatherObservation.objects.values("date")
+            .annotate(
+                t_max_avg=Avg("t_max_c"),
+                t_min_avg=Avg("t_min_c"),
+                precip_n=Count("total_precip_mm"),
+                precip_pos=Count("pk", filter=Q(total_precip_mm__gt=0)),
+                precip_wet=Count("pk", filter=Q(total_precip_mm__gte=0.2)),
+                snow_n=Count("total_snow_cm"),
+                snow_pos=Count("pk", filter=Q(total_snow_cm__gt=0)),
+                freeze_n=Count("freeze_day"),
+                freeze_true=Count("pk", filter=Q(freeze_day=True)),
+                days_n=Count("weather_day", filter=~Q(weather_day="")),
+                days_snowy=Count("pk", filter=Q(weather_day=WeatherDay.SNOWY)),
+                days_wet=Count("pk", filter=Q(weather_day=WeatherDay.WET)),
+                days_dry=Count("pk", filter=Q(weather_day=WeatherDay.DRY)),
+            )
+            .order_by("date")
         )
-        created = 0
-        updated = 0
-        with transaction.atomic():
-            for d in dates:
-                qs = WeatherObservation.objects.filter(date=d)
-                # Collect values ignoring nulls
-                t_max_vals = [v for v in qs.values_list("t_max_c", flat=True) if v is not None]
-                t_min_vals = [v for v in qs.values_list("t_min_c", flat=True) if v is not None]
-                precip_vals = [v for v in qs.values_list("total_precip_mm", flat=True) if v is not None]
-                snow_vals = [v for v in qs.values_list("total_snow_cm", flat=True) if v is not None]
-                weather_days = [v for v in qs.values_list("weather_day", flat=True) if v]
-                freeze_days = [v for v in qs.values_list("freeze_day", flat=True) if v is not None]
 
-                t_max_avg = mean(t_max_vals) if t_max_vals else None
-                t_min_avg = mean(t_min_vals) if t_min_vals else None
-                precip_any = bool([x for x in precip_vals if x > 0]) if precip_vals else None
-                snow_any = bool([x for x in snow_vals if x > 0]) if snow_vals else None
+        rows = []
+        for agg in per_date:
+            # Determine weather_day_city deterministically: Snowy > Wet > Dry
+            if agg["snow_pos"]:
+                day_city, match = WeatherDay.SNOWY, agg["days_snowy"]
+            elif agg["precip_wet"]:
+                day_city, match = WeatherDay.WET, agg["days_wet"]
+            else:
+                day_city, match = WeatherDay.DRY, agg["days_dry"]
 
-                # Determine weather_day_city deterministically: Snowy > Wet > Dry
-                day_city: Optional[str] = None
-                if any((x or 0) > 0 for x in snow_vals):
-                    day_city = WeatherDay.SNOWY
-                elif any((x or 0) >= 0.2 for x in precip_vals):
-                    day_city = WeatherDay.WET
-                else:
-                    day_city = WeatherDay.DRY
+            # freeze_day_city by majority (fallback to any if majority uncertain)
+            freeze_city: Optional[bool] = None
+            if agg["freeze_n"]:
+                freeze_city = agg["freeze_true"] >= (agg["freeze_n"] / 2)
 
-                # freeze_day_city by majority (fallback to any if majority uncertain)
-                freeze_city: Optional[bool] = None
-                if freeze_days:
-                    true_count = sum(1 for v in freeze_days if v)
-                    freeze_city = true_count >= (len(freeze_days) / 2)
+            # agreement ratio: share of stations matching city day
+            agree_ratio: Optional[float] = None
+            if agg["days_n"]:
+                agree_ratio = match / agg["days_n"]
 
-                # agreement ratio: share of stations matching city day
-                agree_ratio: Optional[float] = None
-                if weather_days:
-                    match = sum(1 for v in weather_days if v == day_city)
-                    agree_ratio = match / len(weather_days)
+            rows.append(
+                CityDailyWeather(
+                    date=agg["date"],
+                    weather_day_city=day_city,
+                    freeze_day_city=freeze_city,
+                    t_max_avg=agg["t_max_avg"],
+                    t_min_avg=agg["t_min_avg"],
+                    precip_any=bool(agg["precip_pos"]) if agg["precip_n"] else None,
+                    snow_any=bool(agg["snow_pos"]) if agg["snow_n"] else None,
+                    agreement_ratio=agree_ratio,
+                )
+            )
 
-                defaults = {
-                    "weather_day_city": day_city,
-                    "freeze_day_city": freeze_city,
-                    "t_max_avg": t_max_avg,
-                    "t_min_avg": t_min_avg,
-                    "precip_any": precip_any,
-                    "snow_any": snow_any,
-                    "agreement_ratio": agree_ratio,
-                }
-                obj, was_created = CityDailyWeather.objects.update_or_create(date=d, defaults=defaults)
-                if was_created:
-                    created += 1
-                else:
-                    updated += 1
+        with transaction.atomic():
+            existing = set(
+                CityDailyWeather.objects.filter(date__in=[r.date for r in rows]).values_list("date", flat=True)
+            )
+            CityDailyWeather.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=["date"],
+                update_fields=UPDATE_FIELDS,
+                batch_size=1000,
+            )
+        created = len(rows) - len(existing)
+        updated = len(existing)
 
+        # bulk_create sends no post_save; invalidate cached stats and ETags here
+        bump_stats_version()
         self.stdout.write(self.style.SUCCESS(f"City daily weather upserted: created={created}, updated={updated}"))
         return 0
-
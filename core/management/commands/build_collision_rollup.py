@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from core.generation import bump_stats_version
+from core.models import Collision, CollisionDailyRollup
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-day/hour/quadrant collision rollup used by the Stats endpoints."
+
+    def handle(self, *args, **options):
+        groups = (
+            Collision.objects.order_by()
+            .values("date", "hour", "weekday", "month", "quadrant")
+            .annotate(total=Sum("count"), n=Count("id"))
+        )
+        rows = [
+            CollisionDailyRollup(
+                date=g["date"],
+                hour=g["hour"],
+                weekday=g["weekday"],
+                month=g["month"],
+                quadrant=g["quadrant"],
+                count=int(g["total"] or 0),
+                collisions=g["n"],
+            )
+            for g in groups
+        ]
+        with transaction.atomic():
+            CollisionDailyRollup.objects.all().delete()
+            CollisionDailyRollup.objects.bulk_create(rows, batch_size=1000)
+        bump_stats_version()
+
+        self.stdout.write(self.style.SUCCESS(f"Collision rollup rebuilt: rows={len(rows)}"))
+        return 0
@@ -6,10 +6,12 @@ from datetime import datetime
 from math import radians, cos, sin, asin, sqrt
 from pathlib import Path
 from typing import Iterable, Optional, Dict
+from zoneinfo import ZoneInfo
 
 from django.conf import settings
+from django.core.management import call_command
 from django.core.management.base import BaseCommand, CommandParser
-from django.db import transaction
+from django.db import DatabaseError, transaction
 from django.utils import timezone
 
 from core.models import Collision, WeatherStation, Quadrant
@@ -27,24 +29,47 @@ def haversine_km(lon1: float, lat1: float, lon2: float, lat2: float) -> float:
     return c * r
 
 
-def nearest_station_id(lon: float, lat: float) -> Optional[int]:
-    stations = list(WeatherStation.objects.all().values("id", "longitude", "latitude"))
-    if not stations:
-        return None
-    best = None
-    best_d = None
-    for st in stations:
-        s_lon = st.get("longitude")
-        s_lat = st.get("latitude")
+def load_stations() -> list[tuple[int, float, float, float]]:
+    """Stations as (id, lon_rad, lat_rad, cos_lat), fetched once per load."""
+    stations = []
+    for st_id, s_lon, s_lat in WeatherStation.objects.values_list("id", "longitude", "latitude"):
         if s_lon is None or s_lat is None:
             continue
-        d = haversine_km(lon, lat, float(s_lon), float(s_lat))
-        if best_d is None or d < best_d:
-            best_d = d
-            best = st["id"]
+        rlat = radians(float(s_lat))
+        stations.append((st_id, radians(float(s_lon)), rlat, cos(rlat)))
+    return stations
+
+
+def nearest_station_id(
+    lon: float, lat: float, stations: Optional[list[tuple[int, float, float, float]]] = None
+) -> Optional[int]:
+    if stations is None:
+        stations = load_stations()
+    rlon = radians(lon)
+    rlat = radians(lat)
+    cos_lat = cos(rlat)
+    best = None
+    best_a = None
+    for st_id, s_lon, s_lat, s_cos_lat in stations:
+        # Haversine is monotone in a, so asin/sqrt are not needed to rank
+        a = sin((s_lat - rlat) / 2) ** 2 + cos_lat * s_cos_lat * sin((s_lon - rlon) / 2) ** 2
+        if best_a is None or a < best_a:
+            best_a = a
+            best = st_id
     return best
 
 
+def _local_tz():
+    try:
+        return ZoneInfo(getattr(settings, "TIME_ZONE", "America/Edmonton"))
+    except Exception:
+        return timezone.get_default_timezone()
+
+
+# Resolved once; every CSV row is stamped with the same zone
+LOCAL_TZ = _local_tz()
+
+
 def parse_dt_local(s: str) -> Optional[datetime]:
     s = s.strip()
     if not s:
@@ -58,22 +83,16 @@ def parse_dt_local(s: str) -> Optional[datetime]:
             dt_naive = datetime.strptime(s, "%Y-%m-%d %H:%M:%S")
         except ValueError:
             return None
-    try:
-        from zoneinfo import ZoneInfo
+    return dt_naive.replace(tzinfo=LOCAL_TZ)
 
-        tz = ZoneInfo(getattr(settings, "TIME_ZONE", "America/Edmonton"))
-        return timezone.make_aware(dt_naive, tz)
-    except Exception:
-        return timezone.make_aware(dt_naive)
+
+_QUADRANTS = {q.value: q for q in (Quadrant.NW, Quadrant.NE, Quadrant.SW, Quadrant.SE)}
 
 
 def norm_quadrant(q: Optional[str]) -> str:
     if not q:
         return Quadrant.UNKNOWN
-    q2 = q.strip().upper()
-    if q2 in {Quadrant.NW, Quadrant.NE, Quadrant.SW, Quadrant.SE}:
-        return q2
-    return Quadrant.UNKNOWN
+    return _QUADRANTS.get(q.strip().upper(), Quadrant.UNKNOWN)
 
 
 def in_bounds(lon: float, lat: float) -> bool:
@@ -81,6 +100,64 @@ def in_bounds(lon: float, lat: float) -> bool:
     return (-114.5 <= lon <= -113.6) and (50.5 <= lat <= 51.3)
 
 
+CSV_COLUMNS = (
+    "id",
+    "Longitude",
+    "Latitude",
+    "START_DT",
+    "MODIFIED_DT",
+    "DESCRIPTION",
+    "INCIDENT INFO",
+    "Count",
+    "QUADRANT",
+)
+
+
+def column_indexes(header: list[str]) -> tuple[int, ...]:
+    """Positions of CSV_COLUMNS in header; absent columns map to len(header)."""
+    positions = {name: i for i, name in enumerate(header)}
+    for alias in ("Id", "ID"):
+        if "id" not in positions and alias in positions:
+            positions["id"] = positions[alias]
+    return tuple(positions.get(name, len(header)) for name in CSV_COLUMNS)
+
+
+BATCH_SIZE = 1000
+UPSERT_FIELDS = [
+    "occurred_at",
+    "modified_at",
+    "date",
+    "hour",
+    "weekday",
+    "month",
+    "quadrant",
+    "longitude",
+    "latitude",
+    "count",
+    "description",
+    "location_text",
+    "intersection_key",
+    "nearest_station",
+]
+
+
+def upsert_collisions(pending: Dict[str, Collision]) -> tuple[int, int]:
+    """Insert-or-update a batch keyed by collision_id; returns (created, updated)."""
+    if not pending:
+        return 0, 0
+    existing = set(
+        Collision.objects.filter(collision_id__in=list(pending)).values_list("collision_id", flat=True)
+    )
+    Collision.objects.bulk_create(
+        list(pending.values()),
+        update_conflicts=True,
+        unique_fields=["collision_id"],
+        update_fields=UPSERT_FIELDS,
+        batch_size=BATCH_SIZE,
+    )
+    return len(pending) - len(existing), len(existing)
+
+
 class Command(BaseCommand):
     help = "Load traffic collisions from Calgary CSV files and upsert into the database."
 
@@ -122,83 +199,120 @@ class Command(BaseCommand):
         created = 0
         updated = 0
         skipped = 0
+        stations = load_stations()
+        # Rows at the same rounded intersection share their nearest station
+        near_cache: Dict[str, Optional[int]] = {}
+        # Keyed by collision_id so a repeated id within a batch keeps its last row
+        pending: Dict[str, Collision] = {}
 
-        with transaction.atomic():
-            for path in files:
-                with path.open("r", encoding="utf-8-sig", newline="") as fh:
-                    reader = csv.DictReader(fh)
-                    for row in reader:
-                        try:
-                            coll_id = row.get("id") or row.get("Id") or row.get("ID")
-                            if not coll_id:
-                                skipped += 1
-                                continue
-
-                            lon = float(row.get("Longitude", "") or "nan")
-                            lat = float(row.get("Latitude", "") or "nan")
-                            if not (lon == lon and lat == lat):  # NaN check
-                                skipped += 1
-                                continue
-                            if not in_bounds(lon, lat):
-                                skipped += 1
-                                continue
-
-                            occ = parse_dt_local(row.get("START_DT", "") or "")
-                            if not occ:
-                                skipped += 1
-                                continue
-                            mod = parse_dt_local(row.get("MODIFIED_DT", "") or "")
-
-                            desc = (row.get("DESCRIPTION") or "").strip()
-                            loc_text = (row.get("INCIDENT INFO") or "").strip()
-                            count = row.get("Count")
-                            try:
-                                count_val = int(count) if count and count.strip() else 1
-                            except Exception:
-                                count_val = 1
-
-                            q = norm_quadrant(row.get("QUADRANT"))
-
-                            # Derived fields
-                            local_date = occ.date()
-                            hour = occ.hour
-                            weekday = occ.weekday()
-                            month = occ.month
-                            intersection_key = f"{round(lat, 4)}:{round(lon, 4)}"
-
-                            st_id = nearest_station_id(lon, lat)
-
-                            defaults = {
-                                "occurred_at": occ,
-                                "modified_at": mod,
-                                "date": local_date,
-                                "hour": hour,
-                                "weekday": weekday,
-                                "month": month,
-                                "quadrant": q,
-                                "longitude": lon,
-                                "latitude": lat,
-                                "count": count_val,
-                                "description": desc,
-                                "location_text": loc_text,
-                                "intersection_key": intersection_key,
-                                "nearest_station_id": st_id,
-                            }
-
-                            obj, was_created = Collision.objects.update_or_create(
-                                collision_id=coll_id, defaults=defaults
-                            )
-                            if was_created:
-                                created += 1
-                            else:
-                                updated += 1
-                        except Exception:
+        for path in files:
+            with path.open("r", encoding="utf-8-sig", newline="") as fh:
+                reader = csv.reader(fh)
+                header = next(reader, None)
+                if header is None:
+                    continue
+                # Resolve column positions once; short rows are padded so
+                # absent columns (index == width) read as ""
+                width = len(header)
+                i_id, i_lon, i_lat, i_start, i_mod, i_desc, i_info, i_count, i_quad = column_indexes(header)
+                for row in reader:
+                    if len(row) <= width:
+                        row.extend([""] * (width + 1 - len(row)))
+                    try:
+                        coll_id = row[i_id]
+                        if not coll_id:
+                            skipped += 1
+                            continue
+
+                        lon = float(row[i_lon] or "nan")
+                        lat = float(row[i_lat] or "nan")
+                        if not (lon == lon and lat == lat):  # NaN check
                             skipped += 1
                             continue
+                        if not in_bounds(lon, lat):
+                            skipped += 1
+                            continue
+
+                        occ = parse_dt_local(row[i_start])
+                        if not occ:
+                            skipped += 1
+                            continue
+                        mod = parse_dt_local(row[i_mod])
+
+                        desc = row[i_desc].strip()
+                        loc_text = row[i_info].strip()
+                        count = row[i_count]
+                        try:
+                            count_val = int(count) if count and count.strip() else 1
+                        except Exception:
+                            count_val = 1
+
+                        q = norm_quadrant(row[i_quad])
+
+                        # Derived fields
+                        local_date = occ.date()
+                        hour = occ.hour
+                        weekday = occ.weekday()
+                        month = occ.month
+                        intersection_key = f"{round(lat, 4)}:{round(lon, 4)}"
+
+                        if intersection_key in near_cache:
+                            st_id = near_cache[intersection_key]
+                        else:
+                            st_id = near_cache[intersection_key] = nearest_station_id(lon, lat, stations)
+
+                        pending[coll_id] = Collision(
+                            collision_id=coll_id,
+                            occurred_at=occ,
+                            modified_at=mod,
+                            date=local_date,
+                            hour=hour,
+                            weekday=weekday,
+                            month=month,
+                            quadrant=q,
+                            longitude=lon,
+                            latitude=lat,
+                            count=count_val,
+                            description=desc,
+                            location_text=loc_text,
+                            intersection_key=intersection_key,
+                            nearest_station_id=st_id,
+                        )
+                    except Exception:
+                        skipped += 1
+                        continue
+
+                    if len(pending) >= BATCH_SIZE:
+                        c, u, f = self._flush(pending)
+                        created += c
+                        updated += u
+                        skipped += f
+                        pending.clear()
+
+        c, u, f = self._flush(pending)
+        created += c
+        updated += u
+        skipped += f
 
         self.stdout.write(
             self.style.SUCCESS(
                 f"Collisions upserted: created={created}, updated={updated}, skipped={skipped}"
             )
         )
+        # Keep the Stats rollup in step with the freshly loaded collisions; the rebuild
+        # also bumps the stats generation, which bulk_create's missing post_save skips
+        call_command("build_collision_rollup", stdout=self.stdout)
         return 0
+
+    def _flush(self, pending: Dict[str, Collision]) -> tuple[int, int, int]:
+        """Upsert one batch in its own transaction; returns (created, updated, failed)."""
+        try:
+            with transaction.atomic():
+                created, updated = upsert_collisions(pending)
+        except DatabaseError as exc:
+            first = next(iter(pending), "")
+            self.stderr.write(
+                self.style.WARNING(f"Batch of {len(pending)} rows starting at {first} failed: {exc}")
+            )
+            return 0, 0, len(pending)
+        return created, updated, 0
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import csv
+from datetime import date
 from pathlib import Path
 from typing import Optional, Iterable, Dict, Any
 
@@ -8,6 +9,7 @@ from django.core.management.base import BaseCommand, CommandParser
 from django.db import transaction
 from django.conf import settings
 
+from core.generation import bump_stats_version
 from core.models import WeatherStation, WeatherObservation, WeatherDay
 
 
@@ -15,19 +17,47 @@ def _norm_header(name: str) -> str:
     return name.strip().lower()
 
 
-def _get(row: Dict[str, str], keys: Iterable[str], default: Optional[str] = None) -> Optional[str]:
-    # case-insensitive partial key match helper
-    lower_map = {k.lower(): v for k, v in row.items()}
+_COLUMNS: Dict[str, list[str]] = {
+    "name": ["Station Name"],
+    "climate_id": ["Climate ID"],
+    "lon": ["Longitude (x)", "Longitude"],
+    "lat": ["Latitude (y)", "Latitude"],
+    "date": ["Date/Time", "Date"],
+    "t_max": ["Max Temp"],
+    "t_min": ["Min Temp"],
+    "t_mean": ["Mean Temp"],
+    "rain": ["Total Rain"],
+    "snow": ["Total Snow"],
+    "precip": ["Total Precip"],
+    "snow_grnd": ["Snow on Grnd"],
+    "gust_dir": ["Dir of Max Gust"],
+    "gust": ["Spd of Max Gust"],
+}
+
+
+def _column_index(header_map: Dict[str, int], keys: Iterable[str]) -> Optional[int]:
+    # case-insensitive partial key match helper, resolved once per file
     for key in keys:
         key_l = key.lower()
         # exact
-        if key_l in lower_map:
-            return lower_map[key_l]
+        if key_l in header_map:
+            return header_map[key_l]
         # partial contains
-        for k in lower_map.keys():
+        for k, i in header_map.items():
             if key_l in k:
-                return lower_map[k]
-    return default
+                return i
+    return None
+
+
+def _resolve_columns(header: list[str]) -> Dict[str, Optional[int]]:
+    header_map = {h.lower(): i for i, h in enumerate(header)}
+    return {field: _column_index(header_map, keys) for field, keys in _COLUMNS.items()}
+
+
+def _get(row: list[str], index: Optional[int], default: Optional[str] = None) -> Optional[str]:
+    if index is None or index >= len(row):
+        return default
+    return row[index]
 
 
 def _coerce_float(val: Optional[str]) -> Optional[float]:
@@ -51,6 +81,44 @@ def _coerce_int(val: Optional[str]) -> Optional[int]:
     return int(f) if f is not None else None
 
 
+BATCH_SIZE = 1000
+OBSERVATION_FIELDS = [
+    "t_max_c",
+    "t_min_c",
+    "t_mean_c",
+    "total_rain_mm",
+    "total_snow_cm",
+    "total_precip_mm",
+    "snow_on_ground_cm",
+    "gust_dir_10deg",
+    "gust_kmh",
+    "weather_day",
+    "freeze_day",
+]
+
+
+def _upsert_observations(pending: Dict[tuple, WeatherObservation]) -> tuple[int, int]:
+    """Insert-or-update a batch keyed by (station_id, date); returns (created, updated)."""
+    if not pending:
+        return 0, 0
+    station_ids = {station_id for station_id, _ in pending}
+    dates = {obs_date for _, obs_date in pending}
+    existing = set(
+        WeatherObservation.objects.filter(station_id__in=station_ids, date__in=dates).values_list(
+            "station_id", "date"
+        )
+    )
+    n_existing = len(existing & pending.keys())
+    WeatherObservation.objects.bulk_create(
+        list(pending.values()),
+        update_conflicts=True,
+        unique_fields=["station", "date"],
+        update_fields=OBSERVATION_FIELDS,
+        batch_size=BATCH_SIZE,
+    )
+    return len(pending) - n_existing, n_existing
+
+
 class Command(BaseCommand):
     help = "Load weather stations and daily observations from Environment Canada CSV files."
 
@@ -91,6 +159,8 @@ class Command(BaseCommand):
                 f"Stations created/updated: {created_stations}/{updated_stations}; Observations created/updated: {created_obs}/{updated_obs}"
             )
         )
+        # bulk_create sends no post_save; invalidate cached stats and ETags here
+        bump_stats_version()
         return 0
 
     def _load_file(self, path: Path) -> tuple[int, int, int, int]:
@@ -98,69 +168,76 @@ class Command(BaseCommand):
         updated_st = 0
         created_obs = 0
         updated_obs = 0
+        pending: Dict[tuple, WeatherObservation] = {}
+        seen_stations: Dict[str, WeatherStation] = {}
 
         with path.open("r", encoding="utf-8-sig", newline="") as fh:
-            reader = csv.DictReader(fh)
+            reader = csv.reader(fh)
+            header = next(reader, None)
+            if header is None:
+                return created_st, updated_st, created_obs, updated_obs
+            cols = _resolve_columns(header)
             for row in reader:
                 # Station fields
-                name = _get(row, ["Station Name"]) or "Unknown"
-                climate_id = _get(row, ["Climate ID"]) or ""
-                lon = _coerce_float(_get(row, ["Longitude (x)", "Longitude"]))
-                lat = _coerce_float(_get(row, ["Latitude (y)", "Latitude"]))
+                name = _get(row, cols["name"]) or "Unknown"
+                climate_id = _get(row, cols["climate_id"]) or ""
+                lon = _coerce_float(_get(row, cols["lon"]))
+                lat = _coerce_float(_get(row, cols["lat"]))
                 if not climate_id:
                     # Skip rows without climate id
                     continue
-                # Upsert station, ensuring required lon/lat on create
-                station = WeatherStation.objects.filter(climate_id=climate_id).first()
+                # Stations repeat on every row of a file; upsert each climate_id once
+                station = seen_stations.get(climate_id)
                 if station is None:
-                    if lon is None or lat is None:
-                        # cannot create without coordinates; skip until a row provides them
-                        continue
-                    station = WeatherStation.objects.create(
-                        climate_id=climate_id,
-                        name=name,
-                        longitude=lon,
-                        latitude=lat,
-                    )
-                    created_st += 1
-                else:
-                    changed = False
-                    if name and station.name != name:
-                        station.name = name
-                        changed = True
-                    if lon is not None and station.longitude != lon:
-                        station.longitude = lon
-                        changed = True
-                    if lat is not None and station.latitude != lat:
-                        station.latitude = lat
-                        changed = True
-                    if changed:
-                        station.save(update_fields=["name", "longitude", "latitude"])
-                        updated_st += 1
+                    # Upsert station, ensuring required lon/lat on create
+                    station = WeatherStation.objects.filter(climate_id=climate_id).first()
+                    if station is None:
+                        if lon is None or lat is None:
+                            # cannot create without coordinates; skip until a row provides them
+                            continue
+                        station = WeatherStation.objects.create(
+                            climate_id=climate_id,
+                            name=name,
+                            longitude=lon,
+                            latitude=lat,
+                        )
+                        created_st += 1
+                    else:
+                        changed = False
+                        if name and station.name != name:
+                            station.name = name
+                            changed = True
+                        if lon is not None and station.longitude != lon:
+                            station.longitude = lon
+                            changed = True
+                        if lat is not None and station.latitude != lat:
+                            station.latitude = lat
+                            changed = True
+                        if changed:
+                            station.save(update_fields=["name", "longitude", "latitude"])
+                            updated_st += 1
+                    seen_stations[climate_id] = station
 
                 # Observation fields
-                date_str = _get(row, ["Date/Time", "Date"])
+                date_str = _get(row, cols["date"])
                 if not date_str:
                     continue
                 # format: YYYY-MM-DD
                 try:
-                    from datetime import date as _date
-
-                    parts = [int(p) for p in date_str.split("-")[:3]]
-                    obs_date = _date(parts[0], parts[1], parts[2])
-                except Exception:
+                    obs_date = date.fromisoformat(date_str.strip())
+                except ValueError:
                     # Skip bad date
                     continue
 
-                t_max = _coerce_float(_get(row, ["Max Temp"]))
-                t_min = _coerce_float(_get(row, ["Min Temp"]))
-                t_mean = _coerce_float(_get(row, ["Mean Temp"]))
-                rain = _coerce_float(_get(row, ["Total Rain"]))
-                snow = _coerce_float(_get(row, ["Total Snow"]))
-                precip = _coerce_float(_get(row, ["Total Precip"]))
-                snow_grnd = _coerce_float(_get(row, ["Snow on Grnd"]))
-                gust_dir = _coerce_int(_get(row, ["Dir of Max Gust"]))
-                gust = _coerce_int(_get(row, ["Spd of Max Gust"]))
+                t_max = _coerce_float(_get(row, cols["t_max"]))
+                t_min = _coerce_float(_get(row, cols["t_min"]))
+                t_mean = _coerce_float(_get(row, cols["t_mean"]))
+                rain = _coerce_float(_get(row, cols["rain"]))
+                snow = _coerce_float(_get(row, cols["snow"]))
+                precip = _coerce_float(_get(row, cols["precip"]))
+                snow_grnd = _coerce_float(_get(row, cols["snow_grnd"]))
+                gust_dir = _coerce_int(_get(row, cols["gust_dir"]))
+                gust = _coerce_int(_get(row, cols["gust"]))
 
                 # Derived
                 weather_day: Optional[str]
@@ -181,25 +258,29 @@ class Command(BaseCommand):
                 if t_min is not None:
                     freeze_day = bool(t_min < 0)
 
-                defaults = {
-                    "t_max_c": t_max,
-                    "t_min_c": t_min,
-                    "t_mean_c": t_mean,
-                    "total_rain_mm": rain,
-                    "total_snow_cm": snow,
-                    "total_precip_mm": precip,
-                    "snow_on_ground_cm": snow_grnd,
-                    "gust_dir_10deg": gust_dir,
-                    "gust_kmh": gust,
-                    "weather_day": weather_day,
-                    "freeze_day": freeze_day,
-                }
-                obj, created = WeatherObservation.objects.update_or_create(
-                    station=station, date=obs_date, defaults=defaults
+                pending[(station.pk, obs_date)] = WeatherObservation(
+                    station=station,
+                    date=obs_date,
+                    t_max_c=t_max,
+                    t_min_c=t_min,
+                    t_mean_c=t_mean,
+                    total_rain_mm=rain,
+                    total_snow_cm=snow,
+                    total_precip_mm=precip,
+                    snow_on_ground_cm=snow_grnd,
+                    gust_dir_10deg=gust_dir,
+                    gust_kmh=gust,
+                    weather_day=weather_day,
+                    freeze_day=freeze_day,
                 )
-                if created:
-                    created_obs += 1
-                else:
-                    updated_obs += 1
+                if len(pending) >= BATCH_SIZE:
+                    c, u = _upsert_observations(pending)
+                    created_obs += c
+                    updated_obs += u
+                    pending.clear()
+
+        c, u = _upsert_observations(pending)
+        created_obs += c
+        updated_obs += u
 
         return created_st, updated_st, created_obs, updated_obs
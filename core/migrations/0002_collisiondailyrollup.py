@@ -0,0 +1,29 @@
+# Generated by Django 6.0 on 2026-10-15 21:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CollisionDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('hour', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('weekday', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('month', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('quadrant', models.CharField(choices=[('NW', 'NW'), ('NE', 'NE'), ('SW', 'SW'), ('SE', 'SE'), ('UNK', 'Unknown')], default='UNK', max_length=3)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('collisions', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['date', 'quadrant'], name='core_collis_date_fe86d6_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-15 21:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_collisiondailyrollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='collision',
+            index=models.Index(condition=models.Q(('intersection_key', ''), _negated=True), fields=['intersection_key', 'location_text', 'count'], name='collision_intkey_nonempty_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-15 21:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_collision_intkey_nonempty_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='collision',
+            index=models.Index(fields=['latitude', 'longitude'], name='collision_lat_lon_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-15 21:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_collision_lat_lon_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='collision',
+            index=models.Index(fields=['-occurred_at', '-id'], name='collision_occurred_id_idx'),
+        ),
+    ]
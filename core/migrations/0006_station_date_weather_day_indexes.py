@@ -0,0 +1,21 @@
+# Generated by Django 6.0 on 2026-10-15 21:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_collision_occurred_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='citydailyweather',
+            index=models.Index(fields=['weather_day_city', 'date'], name='cityweather_day_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='collision',
+            index=models.Index(fields=['nearest_station', 'date'], name='collision_station_date_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 6.0 on 2026-10-15 21:53
+
+import time
+
+from django.db import migrations, models
+
+
+def create_generation(apps, schema_editor):
+    # Seed the single row so the first stats request only has to read it
+    DataGeneration = apps.get_model('core', 'DataGeneration')
+    DataGeneration.objects.get_or_create(pk=1, defaults={'version': time.time_ns()})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_station_date_weather_day_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataGeneration',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(create_generation, migrations.RunPython.noop),
+    ]
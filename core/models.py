@@ -71,7 +71,11 @@ class CityDailyWeather(models.Model):
     agreement_ratio = models.FloatField(null=True, blank=True)
 
     class Meta:
-        indexes = [models.Index(fields=["date"])]
+        indexes = [
+            models.Index(fields=["date"]),
+            # weather_day_city filter and by-weather stats
+            models.Index(fields=["weather_day_city", "date"], name="cityweather_day_date_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"CityWeather {self.date}"
@@ -107,13 +111,65 @@ class Collision(models.Model):
         indexes = [
             models.Index(fields=["date", "quadrant"]),
             models.Index(fields=["occurred_at"]),
+            # Keyset pagination order for the collisions list
+            models.Index(fields=["-occurred_at", "-id"], name="collision_occurred_id_idx"),
             models.Index(fields=["nearest_station"]),
+            # station filter narrowed by a from/to date range; also the gust_min join key
+            models.Index(fields=["nearest_station", "date"], name="collision_station_date_idx"),
+            # Bounding-box prefilter for the near endpoint
+            models.Index(fields=["latitude", "longitude"], name="collision_lat_lon_idx"),
+            # Top-intersections groups only keyed rows; partial index matches that predicate
+            models.Index(
+                fields=["intersection_key", "location_text", "count"],
+                condition=~models.Q(intersection_key=""),
+                name="collision_intkey_nonempty_idx",
+            ),
         ]
 
     def __str__(self) -> str:
         return f"Collision {self.collision_id}"
 
 
+class CollisionDailyRollup(models.Model):
+    """Collision totals pre-grouped by the Stats axes (date/hour/quadrant).
+
+    Rebuilt by the ``build_collision_rollup`` command after collisions load;
+    saving or deleting a single Collision adjusts just its bucket (see
+    ``core.signals``). ``QuerySet.update()`` sends no signal, so run the
+    command after one.
+    """
+
+    date = models.DateField()
+    hour = models.PositiveSmallIntegerField(null=True, blank=True)
+    weekday = models.PositiveSmallIntegerField(null=True, blank=True)
+    month = models.PositiveSmallIntegerField(null=True, blank=True)
+    quadrant = models.CharField(max_length=3, choices=Quadrant.choices, default=Quadrant.UNKNOWN)
+    # Sum of Collision.count, named alike so Stats aggregates work on either table
+    count = models.PositiveIntegerField(default=0)
+    collisions = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["date", "quadrant"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"Rollup {self.date} {self.hour} {self.quadrant}"
+
+
+class DataGeneration(models.Model):
+    """Single-row counter moved forward whenever collision or weather data changes.
+
+    Kept in the database so web workers and loader processes agree on it;
+    stats cache keys and ETags are derived from it (see ``core.generation``).
+    """
+
+    version = models.BigIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"Generation {self.version}"
+
+
 class Flag(models.Model):
     collision = models.ForeignKey(Collision, on_delete=models.CASCADE, related_name="flags")
     note = models.TextField()
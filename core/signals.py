@@ -0,0 +1,55 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Collision, CollisionDailyRollup
+
+# Collision columns that pick the rollup row a collision is counted in
+ROLLUP_AXES = ("date", "hour", "weekday", "month", "quadrant")
+
+
+def _add_to_bucket(bucket: dict, count: int) -> None:
+    updated = CollisionDailyRollup.objects.filter(**bucket).update(
+        count=F("count") + count, collisions=F("collisions") + 1
+    )
+    if not updated:
+        CollisionDailyRollup.objects.create(count=count, collisions=1, **bucket)
+
+
+def _remove_from_bucket(bucket: dict, count: int) -> None:
+    rows = CollisionDailyRollup.objects.filter(**bucket)
+    # Clamped: a QuerySet.update() the rollup never saw may have left it short
+    rows.update(count=Greatest(F("count") - count, 0), collisions=Greatest(F("collisions") - 1, 0))
+    # build_collision_rollup writes no empty buckets; match it
+    rows.filter(collisions=0).delete()
+
+
+@receiver(pre_save, sender=Collision)
+def remember_rollup_bucket(sender, instance, **kwargs):
+    # The stored row, so post_save can take its share out of the old bucket
+    instance._rollup_previous = None
+    if instance.pk is not None:
+        instance._rollup_previous = (
+            Collision.objects.filter(pk=instance.pk).values(*ROLLUP_AXES, "count").first()
+        )
+
+
+@receiver(post_save, sender=Collision)
+def update_rollup_on_save(sender, instance, **kwargs):
+    # An empty rollup means Stats aggregate collisions directly; nothing to keep in step
+    if not CollisionDailyRollup.objects.exists():
+        return
+    previous = getattr(instance, "_rollup_previous", None)
+    with transaction.atomic():
+        if previous is not None:
+            _remove_from_bucket({axis: previous[axis] for axis in ROLLUP_AXES}, previous["count"])
+        _add_to_bucket({axis: getattr(instance, axis) for axis in ROLLUP_AXES}, instance.count)
+
+
+@receiver(post_delete, sender=Collision)
+def update_rollup_on_delete(sender, instance, **kwargs):
+    if not CollisionDailyRollup.objects.exists():
+        return
+    _remove_from_bucket({axis: getattr(instance, axis) for axis in ROLLUP_AXES}, instance.count)
@@ -0,0 +1,32 @@
+import pytest
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from . import factories
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _fast_password_hasher():
+    # PBKDF2 is deliberately slow; tests never need real password hashing
+    settings.PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+@pytest.fixture(autouse=True)
+def _reseed_factories():
+    # Each test draws the same factory data whatever ran before it in this process
+    factories.reseed()
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    # Stats responses are cached; keep tests isolated from each other
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(scope="session")
+def api_client():
+    # Tests never authenticate, so one client can serve the whole session
+    return APIClient()
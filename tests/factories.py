@@ -15,7 +15,29 @@ from core.models import (
     WeatherDay,
 )
 
+# Seeded so factory data, and any failure it provokes, reproduces run to run;
+# conftest reseeds _RNG per test so draws do not depend on test order or xdist split
+FACTORY_SEED = 0xC0FFEE
+Faker.seed(FACTORY_SEED)
 fake = Faker()
+_RNG = random.Random(FACTORY_SEED)
+EDMONTON_TZ = ZoneInfo("America/Edmonton")
+# Faker walks its locale providers per call; draw small text pools once
+_SENTENCES = tuple(fake.sentence(nb_words=6) for _ in range(64))
+_STREETS = tuple(fake.street_name() for _ in range(64))
+
+_PRECIP_CHOICES = (0.0, 0.5, 2.0)
+_SNOW_CHOICES = (0.0, 1.0)
+_GUST_CHOICES = (None, 20, 40, 60)
+_WEATHER_DAYS = (WeatherDay.DRY, WeatherDay.WET, WeatherDay.SNOWY)
+_BOOLS = (True, False)
+_QUADRANTS = (Quadrant.NE, Quadrant.NW, Quadrant.SE, Quadrant.SW)
+_COUNTS = (1, 1, 2)
+
+
+def reseed() -> None:
+    """Restart the factory random stream from FACTORY_SEED."""
+    _RNG.seed(FACTORY_SEED)
 
 
 class WeatherStationFactory(factory.django.DjangoModelFactory):
@@ -24,8 +46,8 @@ class WeatherStationFactory(factory.django.DjangoModelFactory):
 
     climate_id = factory.Sequence(lambda n: f"3031{n:03d}")
     name = factory.LazyAttribute(lambda o: f"Station {o.climate_id}")
-    longitude = factory.LazyFunction(lambda: random.uniform(-114.3, -113.8))
-    latitude = factory.LazyFunction(lambda: random.uniform(50.9, 51.2))
+    longitude = factory.LazyFunction(lambda: _RNG.uniform(-114.3, -113.8))
+    latitude = factory.LazyFunction(lambda: _RNG.uniform(50.9, 51.2))
 
 
 class WeatherObservationFactory(factory.django.DjangoModelFactory):
@@ -33,28 +55,28 @@ class WeatherObservationFactory(factory.django.DjangoModelFactory):
         model = WeatherObservation
 
     station = factory.SubFactory(WeatherStationFactory)
-    date = factory.LazyFunction(lambda: date(2024, 1, 1) + timedelta(days=random.randint(0, 365)))
-    t_max_c = factory.LazyFunction(lambda: random.uniform(-20, 30))
-    t_min_c = factory.LazyFunction(lambda: random.uniform(-30, 15))
-    total_precip_mm = factory.LazyFunction(lambda: random.choice([0.0, 0.5, 2.0]))
-    total_snow_cm = factory.LazyFunction(lambda: random.choice([0.0, 1.0]))
-    gust_kmh = factory.LazyFunction(lambda: random.choice([None, 20, 40, 60]))
-    weather_day = factory.LazyFunction(lambda: random.choice([WeatherDay.DRY, WeatherDay.WET, WeatherDay.SNOWY]))
-    freeze_day = factory.LazyFunction(lambda: random.choice([True, False]))
+    date = factory.LazyFunction(lambda: date(2024, 1, 1) + timedelta(days=_RNG.randint(0, 365)))
+    t_max_c = factory.LazyFunction(lambda: _RNG.uniform(-20, 30))
+    t_min_c = factory.LazyFunction(lambda: _RNG.uniform(-30, 15))
+    total_precip_mm = factory.LazyFunction(lambda: _RNG.choice(_PRECIP_CHOICES))
+    total_snow_cm = factory.LazyFunction(lambda: _RNG.choice(_SNOW_CHOICES))
+    gust_kmh = factory.LazyFunction(lambda: _RNG.choice(_GUST_CHOICES))
+    weather_day = factory.LazyFunction(lambda: _RNG.choice(_WEATHER_DAYS))
+    freeze_day = factory.LazyFunction(lambda: _RNG.choice(_BOOLS))
 
 
 class CityDailyWeatherFactory(factory.django.DjangoModelFactory):
     class Meta:
         model = CityDailyWeather
 
-    date = factory.LazyFunction(lambda: date(2024, 1, 1) + timedelta(days=random.randint(0, 365)))
-    weather_day_city = factory.LazyFunction(lambda: random.choice([WeatherDay.DRY, WeatherDay.WET, WeatherDay.SNOWY]))
-    freeze_day_city = factory.LazyFunction(lambda: random.choice([True, False]))
-    t_max_avg = factory.LazyFunction(lambda: random.uniform(-15, 25))
-    t_min_avg = factory.LazyFunction(lambda: random.uniform(-25, 10))
-    precip_any = factory.LazyFunction(lambda: random.choice([True, False]))
-    snow_any = factory.LazyFunction(lambda: random.choice([True, False]))
-    agreement_ratio = factory.LazyFunction(lambda: random.uniform(0.4, 1.0))
+    date = factory.LazyFunction(lambda: date(2024, 1, 1) + timedelta(days=_RNG.randint(0, 365)))
+    weather_day_city = factory.LazyFunction(lambda: _RNG.choice(_WEATHER_DAYS))
+    freeze_day_city = factory.LazyFunction(lambda: _RNG.choice(_BOOLS))
+    t_max_avg = factory.LazyFunction(lambda: _RNG.uniform(-15, 25))
+    t_min_avg = factory.LazyFunction(lambda: _RNG.uniform(-25, 10))
+    precip_any = factory.LazyFunction(lambda: _RNG.choice(_BOOLS))
+    snow_any = factory.LazyFunction(lambda: _RNG.choice(_BOOLS))
+    agreement_ratio = factory.LazyFunction(lambda: _RNG.uniform(0.4, 1.0))
 
 
 class CollisionFactory(factory.django.DjangoModelFactory):
@@ -64,8 +86,7 @@ class CollisionFactory(factory.django.DjangoModelFactory):
     collision_id = factory.Sequence(lambda n: f"C{2024}{n:05d}")
     @factory.lazy_attribute
     def occurred_at(self):
-        tz = ZoneInfo("America/Edmonton")
-        dt = datetime(2024, 6, 1, 12, 0, 0, tzinfo=tz) + timedelta(hours=random.randint(0, 500))
+        dt = datetime(2024, 6, 1, 12, 0, 0, tzinfo=EDMONTON_TZ) + timedelta(hours=_RNG.randint(0, 500))
         return dt
     @factory.lazy_attribute
     def date(self):
@@ -73,13 +94,18 @@ class CollisionFactory(factory.django.DjangoModelFactory):
     hour = factory.LazyAttribute(lambda o: o.occurred_at.hour)
     weekday = factory.LazyAttribute(lambda o: o.occurred_at.weekday())
     month = factory.LazyAttribute(lambda o: o.occurred_at.month)
-    quadrant = factory.LazyFunction(lambda: random.choice([Quadrant.NE, Quadrant.NW, Quadrant.SE, Quadrant.SW]))
-    longitude = factory.LazyFunction(lambda: random.uniform(-114.3, -113.8))
-    latitude = factory.LazyFunction(lambda: random.uniform(50.9, 51.2))
-    count = factory.LazyFunction(lambda: random.choice([1, 1, 2]))
-    description = factory.LazyFunction(lambda: fake.sentence(nb_words=6))
-    location_text = factory.LazyFunction(lambda: fake.street_name())
+    quadrant = factory.LazyFunction(lambda: _RNG.choice(_QUADRANTS))
+    longitude = factory.LazyFunction(lambda: _RNG.uniform(-114.3, -113.8))
+    latitude = factory.LazyFunction(lambda: _RNG.uniform(50.9, 51.2))
+    count = factory.LazyFunction(lambda: _RNG.choice(_COUNTS))
+    description = factory.LazyFunction(lambda: _RNG.choice(_SENTENCES))
+    location_text = factory.LazyFunction(lambda: _RNG.choice(_STREETS))
     intersection_key = factory.LazyAttribute(lambda o: f"{round(o.latitude,4)}:{round(o.longitude,4)}")
+    # Most tests never read the station; opt in via CollisionWithStationFactory
+    nearest_station = None
+
+
+class CollisionWithStationFactory(CollisionFactory):
     nearest_station = factory.SubFactory(WeatherStationFactory)
 
 
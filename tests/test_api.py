@@ -1,33 +1,55 @@
+from datetime import timedelta
+from io import StringIO
+
 import pytest
-from rest_framework.test import APIClient
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db.models import F
+
+from .factories import (
+    CollisionFactory,
+    CollisionWithStationFactory,
+    CityDailyWeatherFactory,
+    WeatherObservationFactory,
+    WeatherStationFactory,
+)
+from api.serializers import CollisionDetailSerializer
+from api.views import _CachedStatsView
+from core.generation import STATS_VERSION_KEY, stats_version
+from core.models import Collision, CollisionDailyRollup, DataGeneration, Flag, WeatherDay
 
-from .factories import CollisionFactory, FlagFactory, CityDailyWeatherFactory
-from core.models import Flag, WeatherDay
+STATS_PATHS = (
+    "/api/v1/stats/monthly-trend",
+    "/api/v1/stats/by-hour",
+    "/api/v1/stats/weekday",
+    "/api/v1/stats/quadrant-share",
+    "/api/v1/stats/top-intersections",
+    "/api/v1/stats/by-weather",
+)
 
 
 @pytest.mark.django_db
-def test_collisions_list_detail_and_flag():
+def test_collisions_list_detail_and_flag(api_client):
     c1 = CollisionFactory()
     c2 = CollisionFactory()
     c3 = CollisionFactory()
 
-    client = APIClient()
-
     # List
-    resp = client.get("/api/v1/collisions/")
+    resp = api_client.get("/api/v1/collisions/")
     assert resp.status_code == 200
-    assert "results" in resp.json()
-    assert len(resp.json()["results"]) >= 3
+    payload = resp.json()
+    assert "results" in payload
+    assert len(payload["results"]) >= 3
 
     # Detail by collision_id
-    resp = client.get(f"/api/v1/collisions/{c1.collision_id}/")
+    resp = api_client.get(f"/api/v1/collisions/{c1.collision_id}/")
     assert resp.status_code == 200
     payload = resp.json()
     assert payload["collision_id"] == c1.collision_id
     assert "city_weather" in payload
 
     # Create flag
-    resp = client.post(
+    resp = api_client.post(
         "/api/v1/flags/",
         {"collision": c1.collision_id, "note": "hazard present"},
         format="json",
@@ -38,43 +60,274 @@ def test_collisions_list_detail_and_flag():
 
     # Retrieve flag
     if flag_id:
-        r = client.get(f"/api/v1/flags/{flag_id}/")
+        r = api_client.get(f"/api/v1/flags/{flag_id}/")
         assert r.status_code == 200
 
         # Update note (PATCH)
-        r = client.patch(f"/api/v1/flags/{flag_id}/", {"note": "updated note"}, format="json")
+        r = api_client.patch(f"/api/v1/flags/{flag_id}/", {"note": "updated note"}, format="json")
         assert r.status_code in (200, 202)
         # Delete
-        r = client.delete(f"/api/v1/flags/{flag_id}/")
+        r = api_client.delete(f"/api/v1/flags/{flag_id}/")
         assert r.status_code in (200, 202, 204)
 
 
 @pytest.mark.django_db
-def test_filters_and_stats_endpoints():
+def test_filters_and_stats_endpoints(api_client):
     # Create collisions on two dates and quadrants
     c1 = CollisionFactory(quadrant="NE")
-    c2 = CollisionFactory(quadrant="SW")
+    c2 = CollisionFactory(quadrant="SW", occurred_at=c1.occurred_at + timedelta(days=1))
     # City weather for those dates
     CityDailyWeatherFactory(date=c1.date, weather_day_city=WeatherDay.DRY)
     CityDailyWeatherFactory(date=c2.date, weather_day_city=WeatherDay.WET)
 
-    client = APIClient()
-
     # Filter by quadrant
-    r = client.get("/api/v1/collisions/?quadrant=NE")
+    r = api_client.get("/api/v1/collisions/?quadrant=NE")
     assert r.status_code == 200
     results = r.json()["results"]
     assert any(row["quadrant"] == "NE" for row in results)
 
     # Stats endpoints respond
-    for path in [
-        "/api/v1/stats/monthly-trend",
+    for path in STATS_PATHS:
+        resp = api_client.get(path)
+        assert resp.status_code == 200, path
+        assert "results" in resp.json(), path
+
+
+@pytest.mark.django_db
+def test_collision_detail_includes_weather(django_assert_max_num_queries, api_client):
+    c = CollisionWithStationFactory()
+    WeatherObservationFactory(station=c.nearest_station, date=c.date, gust_kmh=40)
+    CityDailyWeatherFactory(date=c.date, weather_day_city=WeatherDay.SNOWY)
+
+    with django_assert_max_num_queries(1):
+        resp = api_client.get(f"/api/v1/collisions/{c.collision_id}/")
+    assert resp.status_code == 200
+    payload = resp.json()
+    assert payload["station_weather"]["gust_kmh"] == 40
+    assert payload["city_weather"]["weather_day_city"] == WeatherDay.SNOWY
+
+
+@pytest.mark.django_db
+def test_stats_by_weather_totals(api_client):
+    dry = CollisionFactory(count=2)
+    CollisionFactory(occurred_at=dry.occurred_at, count=1)
+    snowy = CollisionFactory(occurred_at=dry.occurred_at + timedelta(days=3), count=4)
+    CityDailyWeatherFactory(date=dry.date, weather_day_city=WeatherDay.DRY)
+    CityDailyWeatherFactory(date=snowy.date, weather_day_city=WeatherDay.SNOWY)
+
+    resp = api_client.get("/api/v1/stats/by-weather")
+    assert resp.status_code == 200
+    totals = {row["weather_day"]: row["total"] for row in resp.json()["results"]}
+    assert totals == {WeatherDay.DRY: 3, WeatherDay.WET: 0, WeatherDay.SNOWY: 4}
+
+
+@pytest.mark.django_db
+def test_stats_responses_are_cached(django_assert_num_queries, api_client):
+    CollisionFactory(quadrant="NE")
+    first = api_client.get("/api/v1/stats/quadrant-share?quadrant=NE")
+    assert first.status_code == 200
+    with django_assert_num_queries(0):
+        second = api_client.get("/api/v1/stats/quadrant-share?quadrant=NE")
+    assert second.json() == first.json()
+
+
+@pytest.mark.django_db
+def test_stats_from_rollup_match_collisions(api_client):
+    first = CollisionFactory(quadrant="NE", count=2)
+    CollisionFactory(quadrant="SW", occurred_at=first.occurred_at + timedelta(hours=30))
+    CityDailyWeatherFactory(date=first.date, weather_day_city=WeatherDay.WET)
+    paths = [
+        "/api/v1/stats/monthly-trend?quadrant=NE",
         "/api/v1/stats/by-hour",
-        "/api/v1/stats/weekday",
+        "/api/v1/stats/weekday?weather_day_city=wet",
         "/api/v1/stats/quadrant-share",
-        "/api/v1/stats/top-intersections",
         "/api/v1/stats/by-weather",
-    ]:
-        resp = client.get(path)
-        assert resp.status_code == 200, path
-        assert "results" in resp.json(), path
+    ]
+    expected = {path: api_client.get(path).json() for path in paths}
+
+    call_command("build_collision_rollup")
+    cache.clear()
+    assert CollisionDailyRollup.objects.exists()
+    for path in paths:
+        assert api_client.get(path).json() == expected[path], path
+
+
+@pytest.mark.django_db
+def test_detail_serializer_many_batches_weather(django_assert_num_queries):
+    collisions = [CollisionWithStationFactory() for _ in range(3)]
+    for c in collisions:
+        WeatherObservationFactory(station=c.nearest_station, date=c.date, gust_kmh=60)
+
+    with django_assert_num_queries(2):
+        data = CollisionDetailSerializer(collisions, many=True).data
+    assert [row["station_weather"]["gust_kmh"] for row in data] == [60, 60, 60]
+    assert all(row["city_weather"] is None for row in data)
+
+
+@pytest.mark.django_db
+def test_stats_cache_invalidated_on_collision_change(api_client):
+    first = CollisionFactory(quadrant="NE", count=1)
+    # Serve from the rollup so the test covers keeping it in step, not just the cache
+    call_command("build_collision_rollup", stdout=StringIO())
+    path = "/api/v1/stats/quadrant-share"
+    before = {row["quadrant"]: row["total"] for row in api_client.get(path).json()["results"]}
+    CollisionFactory(quadrant="NE", count=2)
+    after = {row["quadrant"]: row["total"] for row in api_client.get(path).json()["results"]}
+    assert after["NE"] == before["NE"] + 2
+
+    first.delete()
+    final = {row["quadrant"]: row["total"] for row in api_client.get(path).json()["results"]}
+    assert final["NE"] == after["NE"] - 1
+    assert CollisionDailyRollup.objects.exists()
+
+
+def test_cached_stats_view_requires_payload():
+    with pytest.raises(TypeError):
+        class MissingPayload(_CachedStatsView):
+            cache_prefix = "missing"
+
+
+@pytest.mark.django_db
+def test_stats_conditional_get_returns_304(api_client):
+    CollisionFactory()
+    first = api_client.get("/api/v1/stats/weekday")
+    etag = first.headers["ETag"]
+
+    again = api_client.get("/api/v1/stats/weekday", HTTP_IF_NONE_MATCH=etag)
+    assert again.status_code == 304
+
+    CollisionFactory()
+    changed = api_client.get("/api/v1/stats/weekday", HTTP_IF_NONE_MATCH=etag)
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_stats_etag_follows_generation_written_by_another_process(api_client):
+    CollisionFactory()
+    etag = api_client.get("/api/v1/stats/weekday").headers["ETag"]
+
+    # A loader in another process moves the generation in the database; once this
+    # worker's short-lived copy expires, the old validator stops matching
+    DataGeneration.objects.update(version=F("version") + 1)
+    cache.delete(STATS_VERSION_KEY)
+    resp = api_client.get("/api/v1/stats/weekday", HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_stats_if_modified_since_alone_never_returns_304(api_client):
+    CollisionFactory()
+    first = api_client.get("/api/v1/stats/weekday")
+    assert "Last-Modified" not in first.headers
+
+    # Same-second generation change: a whole-second date could not tell it apart
+    DataGeneration.objects.update(version=F("version") + 1)
+    cache.delete(STATS_VERSION_KEY)
+    resp = api_client.get("/api/v1/stats/weekday", HTTP_IF_MODIFIED_SINCE="Fri, 01 Jan 2100 00:00:00 GMT")
+    assert resp.status_code == 200
+
+
+@pytest.mark.django_db
+def test_collisions_list_cursor_pagination(api_client):
+    # Row contents are irrelevant here; one shared station and a single INSERT
+    station = WeatherStationFactory()
+    Collision.objects.bulk_create(CollisionFactory.build_batch(55, nearest_station=station))
+
+    first = api_client.get("/api/v1/collisions/").json()
+    assert len(first["results"]) == 50
+    assert first["next"]
+    second = api_client.get(first["next"]).json()
+    assert len(second["results"]) == 5
+    assert second["next"] is None
+
+    ids = [row["collision_id"] for row in first["results"] + second["results"]]
+    assert len(set(ids)) == 55
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("ordering", ["quadrant", "occurred_at", "-occurred_at"])
+def test_collisions_cursor_pages_ties_once(api_client, ordering):
+    # Every row ties on quadrant and occurred_at; only the id tiebreaker orders them
+    station = WeatherStationFactory()
+    batch = CollisionFactory.build_batch(120, nearest_station=station, quadrant="NE")
+    for c in batch:
+        c.occurred_at = batch[0].occurred_at
+    Collision.objects.bulk_create(batch)
+
+    ids = []
+    url = f"/api/v1/collisions/?ordering={ordering}"
+    while url:
+        page = api_client.get(url).json()
+        ids += [row["collision_id"] for row in page["results"]]
+        url = page["next"]
+    assert len(ids) == 120
+    assert len(set(ids)) == 120
+
+
+@pytest.mark.django_db
+def test_top_intersections_groups_by_key(api_client):
+    CollisionFactory(intersection_key="51.0:-114.0", location_text="Main St / 1 Ave", count=1)
+    CollisionFactory(intersection_key="51.0:-114.0", location_text="1 Ave / Main St", count=2)
+    CollisionFactory(intersection_key="51.1:-114.1", location_text="Other Rd", count=1)
+
+    resp = api_client.get("/api/v1/stats/top-intersections?limit=5")
+    assert resp.status_code == 200
+    top = resp.json()["results"][0]
+    assert top["intersection_key"] == "51.0:-114.0"
+    assert top["location_text"] == "1 Ave / Main St"
+    assert (top["total"], top["collisions"]) == (3, 2)
+
+
+@pytest.mark.django_db
+def test_stats_from_to_aliases(api_client):
+    c = CollisionFactory(count=1)
+    day = c.date.isoformat()
+    totals = lambda path: sum(row["total"] for row in api_client.get(path).json()["results"])
+    assert totals(f"/api/v1/stats/weekday?from={day}&to={day}") == 1
+    assert totals(f"/api/v1/stats/weekday?from_date={day}&to={day}") == 1
+    after = (c.date + timedelta(days=1)).isoformat()
+    assert totals(f"/api/v1/stats/weekday?from={after}") == 0
+
+
+@pytest.mark.django_db
+def test_index_counts_in_one_query_and_cached(django_assert_num_queries, api_client):
+    c = CollisionWithStationFactory()
+    # The data generation is read once and cached; keep it out of the count
+    stats_version()
+    with django_assert_num_queries(1):
+        resp = api_client.get("/")
+    assert resp.status_code == 200
+    assert resp.context["counts"]["collisions"] == 1
+    assert resp.context["counts"]["stations"] == 1
+    assert resp.context["sample_collision_id"] == c.collision_id
+    # Cached until the data changes
+    with django_assert_num_queries(0):
+        api_client.get("/")
+
+
+@pytest.mark.django_db
+def test_stats_bundle_matches_individual_endpoints(django_assert_num_queries, api_client):
+    c = CollisionFactory(quadrant="NW")
+    CityDailyWeatherFactory(date=c.date, weather_day_city=WeatherDay.WET)
+    query = "?quadrant=NW&limit=5"
+    individual = {
+        "monthly_trend": api_client.get("/api/v1/stats/monthly-trend" + query).json(),
+        "by_hour": api_client.get("/api/v1/stats/by-hour" + query).json(),
+        "weekday": api_client.get("/api/v1/stats/weekday" + query).json(),
+    }
+
+    resp = api_client.get("/api/v1/stats/bundle" + query)
+    assert resp.status_code == 200
+    bundle = resp.json()
+    assert set(bundle) == {
+        "monthly_trend", "by_hour", "weekday", "quadrant_share", "top_intersections", "by_weather",
+    }
+    for name, payload in individual.items():
+        assert bundle[name] == payload
+    assert bundle["top_intersections"]["limit"] == 5
+
+    # Every part is now cached; a repeat bundle needs no queries
+    with django_assert_num_queries(0):
+        api_client.get("/api/v1/stats/bundle" + query)
@@ -1,9 +1,19 @@
+from datetime import date
+from io import StringIO
 from pathlib import Path
 import textwrap
 
 from django.core.management import call_command
 
-from core.models import WeatherStation, WeatherObservation, Collision
+from core.management.commands.load_collisions import load_stations, nearest_station_id
+from core.models import (
+    CityDailyWeather,
+    Collision,
+    CollisionDailyRollup,
+    WeatherDay,
+    WeatherObservation,
+    WeatherStation,
+)
 
 
 def test_load_weather_command_small(tmp_path, db, settings):
@@ -40,4 +50,80 @@ def test_load_collisions_command_small(tmp_path, db, settings):
     assert Collision.objects.count() == 2
     assert Collision.objects.filter(collision_id="COLL-1", count=1).exists()
     assert Collision.objects.filter(collision_id="COLL-2", count=2).exists()
+    # Stats rollup is rebuilt after the load
+    assert sum(CollisionDailyRollup.objects.values_list("count", flat=True)) == 3
 
+    # Re-loading the same file updates in place rather than duplicating
+    Collision.objects.filter(collision_id="COLL-1").update(count=9)
+    out = StringIO()
+    call_command("load_collisions", "--csv", str(f), stdout=out)
+    assert "created=0, updated=2" in out.getvalue()
+    assert Collision.objects.count() == 2
+    assert Collision.objects.get(collision_id="COLL-1").count == 1
+
+
+def test_nearest_station_id_picks_closest(db):
+    north = WeatherStation.objects.create(climate_id="N", name="North", longitude=-114.07, latitude=51.15)
+    south = WeatherStation.objects.create(climate_id="S", name="South", longitude=-114.07, latitude=50.90)
+    stations = load_stations()
+    assert nearest_station_id(-114.06, 51.10, stations) == north.id
+    assert nearest_station_id(-114.08, 50.95, stations) == south.id
+    assert nearest_station_id(-114.08, 50.95, []) is None
+
+
+def test_build_city_weather_aggregates_per_date(db):
+    a = WeatherStation.objects.create(climate_id="A", name="A", longitude=-114.0, latitude=51.0)
+    b = WeatherStation.objects.create(climate_id="B", name="B", longitude=-114.1, latitude=51.1)
+    d1, d2 = date(2024, 3, 1), date(2024, 3, 2)
+    WeatherObservation.objects.create(
+        station=a, date=d1, t_max_c=4.0, t_min_c=-2.0, total_precip_mm=0.5, total_snow_cm=0.0,
+        weather_day=WeatherDay.WET, freeze_day=True,
+    )
+    WeatherObservation.objects.create(
+        station=b, date=d1, t_max_c=6.0, t_min_c=1.0, total_precip_mm=0.0, total_snow_cm=0.0,
+        weather_day=WeatherDay.DRY, freeze_day=False,
+    )
+    WeatherObservation.objects.create(station=a, date=d2, total_snow_cm=2.0, weather_day=WeatherDay.SNOWY)
+
+    call_command("build_city_weather", stdout=StringIO())
+
+    day1 = CityDailyWeather.objects.get(date=d1)
+    assert day1.weather_day_city == WeatherDay.WET
+    assert day1.t_max_avg == 5.0 and day1.t_min_avg == -0.5
+    assert day1.precip_any is True and day1.snow_any is False
+    assert day1.freeze_day_city is True
+    assert day1.agreement_ratio == 0.5
+    day2 = CityDailyWeather.objects.get(date=d2)
+    assert day2.weather_day_city == WeatherDay.SNOWY
+    assert day2.precip_any is None and day2.freeze_day_city is None
+    assert day2.agreement_ratio == 1.0
+
+    # Rebuilding updates the same rows in place
+    out = StringIO()
+    call_command("build_city_weather", stdout=out)
+    assert "created=0, updated=2" in out.getvalue()
+
+
+def test_reloading_collisions_refreshes_stats_and_etag(tmp_path, db, api_client):
+    header = '"INCIDENT INFO","DESCRIPTION","START_DT","MODIFIED_DT","QUADRANT","Longitude","Latitude","Count","id"\n'
+    row_a = '"Loc A","Incident.","2024/12/31 11:31:14 PM","","NE","-114.0717","50.9686","1","COLL-1"\n'
+    row_b = '"Loc B","Incident.","2024/12/30 10:16:11 PM","","NE","-114.0266","50.9541","5","COLL-2"\n'
+    f = tmp_path / "Traffic_Incidents_20251218.csv"
+    f.write_text(header + row_a, encoding="utf-8")
+    call_command("load_collisions", "--csv", str(f), stdout=StringIO())
+
+    def ne_total(resp):
+        return {row["quadrant"]: row["total"] for row in resp.json()["results"]}["NE"]
+
+    first = api_client.get("/api/v1/stats/quadrant-share")
+    assert ne_total(first) == 1
+    etag = first.headers["ETag"]
+
+    # Bulk upserts send no post_save; the loader itself must invalidate
+    f.write_text(header + row_a + row_b, encoding="utf-8")
+    call_command("load_collisions", "--csv", str(f), stdout=StringIO())
+
+    resp = api_client.get("/api/v1/stats/quadrant-share", HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] != etag
+    assert ne_total(resp) == 6
@@ -0,0 +1,30 @@
+import pytest
+from django.http import QueryDict
+
+from .factories import CollisionFactory, CityDailyWeatherFactory
+from api.filters import CollisionFilter, apply_collision_filters
+from core.models import Collision, WeatherDay
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "query",
+    [
+        "quadrant=NE",
+        "from_date=2024-06-03&to_date=2024-06-20",
+        "from_date=not-a-date&quadrant=SW",
+        "weather_day_city=snowy",
+        "freeze_day_city=yes&heavy_snow=maybe",
+        "gust_min=abc",
+        "station=",
+    ],
+)
+def test_apply_collision_filters_matches_filterset(query):
+    c1 = CollisionFactory(quadrant="NE")
+    CollisionFactory(quadrant="SW")
+    CityDailyWeatherFactory(date=c1.date, weather_day_city=WeatherDay.SNOWY, freeze_day_city=True)
+
+    params = QueryDict(query)
+    expected = CollisionFilter(params, queryset=Collision.objects.all()).qs
+    actual = apply_collision_filters(Collision.objects.all(), params)
+    assert sorted(actual.values_list("id", flat=True)) == sorted(expected.values_list("id", flat=True))
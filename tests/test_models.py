@@ -1,8 +1,12 @@
+from io import StringIO
+
 import pytest
+from django.core.management import call_command
 from django.db import IntegrityError
 
 from .factories import WeatherStationFactory, WeatherObservationFactory, CollisionFactory
-from core.models import WeatherObservation, Collision
+from core.models import WeatherObservation, Collision, CollisionDailyRollup
+from core.signals import ROLLUP_AXES
 
 
 def test_weather_observation_unique_station_date(db):
@@ -23,3 +27,22 @@ def test_collision_unique_id(db):
             latitude=c1.latitude,
         )
 
+
+def _rollup_rows():
+    return sorted(CollisionDailyRollup.objects.values_list(*ROLLUP_AXES, "count", "collisions"))
+
+
+def test_rollup_follows_single_collision_edits(db):
+    moved = CollisionFactory(quadrant="NE", count=1)
+    removed = CollisionFactory(quadrant="SW", count=2)
+    call_command("build_collision_rollup", stdout=StringIO())
+
+    CollisionFactory(quadrant="NE", count=3)
+    moved.quadrant = "NW"
+    moved.count = 4
+    moved.save()
+    removed.delete()
+    incremental = _rollup_rows()
+
+    call_command("build_collision_rollup", stdout=StringIO())
+    assert incremental == _rollup_rows()
@@ -1,19 +1,19 @@
+from math import pi
+
 import pytest
-from rest_framework.test import APIClient
 
 from .factories import CollisionFactory
 
 
 @pytest.mark.django_db
-def test_near_endpoint_within_radius_sorted():
+def test_near_endpoint_within_radius_sorted(api_client):
     # Seed a reference point
     lat0, lon0 = 51.045, -114.06
     # Create a near and a far collision
     near = CollisionFactory(latitude=lat0 + 0.005, longitude=lon0 + 0.005)
     far = CollisionFactory(latitude=lat0 + 0.05, longitude=lon0 + 0.05)
 
-    client = APIClient()
-    resp = client.get(f"/api/v1/collisions/near?lat={lat0}&lon={lon0}&radius_km=2")
+    resp = api_client.get(f"/api/v1/collisions/near?lat={lat0}&lon={lon0}&radius_km=2")
     assert resp.status_code == 200
     data = resp.json()
     assert data["count"] >= 1
@@ -24,3 +24,26 @@ def test_near_endpoint_within_radius_sorted():
     dists = [r["distance_km"] for r in results]
     assert dists == sorted(dists)
 
+
+@pytest.mark.django_db
+def test_near_distance_matches_haversine_and_respects_limit(api_client):
+    lat0, lon0 = 51.045, -114.06
+    offsets = [0.001, 0.002, 0.003, 0.004]
+    for off in offsets:
+        CollisionFactory(latitude=lat0 + off, longitude=lon0)
+
+    resp = api_client.get(f"/api/v1/collisions/near?lat={lat0}&lon={lon0}&radius_km=1&limit=3")
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert len(results) == 3
+    # Pure latitude offsets: 1 degree ~ 111.195 km on a 6371 km sphere
+    expected = [round(off * 6371 * pi / 180, 3) for off in offsets[:3]]
+    assert [r["distance_km"] for r in results] == pytest.approx(expected, abs=1e-3)
+
+
+@pytest.mark.parametrize("query", ["", "?lat=51.0", "?lon=-114.0", "?lat=abc&lon=-114.0"])
+def test_near_requires_float_lat_lon(api_client, query):
+    # Rejected before any query runs, so no database is needed
+    resp = api_client.get("/api/v1/collisions/near" + query)
+    assert resp.status_code == 400
+    assert "lat and lon" in resp.json()["detail"]